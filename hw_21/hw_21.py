@@ -2,7 +2,12 @@
 Домашнее задание № 21
 Выполнил студент 413 группы - Головатов Андрей
 """
+import hashlib
+import json
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pillow_avif
 from PIL import Image
 from pillow_heif import register_heif_opener, from_pillow as heif_from_pillow
@@ -14,49 +19,102 @@ register_heif_opener()
 
 ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'dng']
 
-# Пример 1: Обход файловой системы
-
-source_path = r"C:\Users\New\PycharmProjects\MyHomeworks"  # Путь к папке с изображениями
-
-# # Вариант 1: Простой обход через listdir
-# files = os.listdir(source_path)  # Получаем список файлов в директории
-# for file in files:
-#     full_path = os.path.join(source_path, file)  # Формируем полный путь
-#     if os.path.isfile(full_path):  # Проверяем что это файл
-#         print(f"Найден файл: {full_path}")
-#
-# # Вариант 2: Рекурсивный обход через walk
-# for root, dirs, files in os.walk(source_path):  # root - текущая директория, dirs - папки, files - файлы
-#     for file in files:
-#         full_path = os.path.join(root, file)  # Формируем полный путь
-#         print(f"Найден файл: {full_path}")
-
-# Открываем изображение
-# Исходное изображение
-source_image = Image.open('Input.jpg')
-
-# Сжатие в WEBP
-source_image.save(
-    "output.webp",
-    format='WEBP',
-    quality=33
-)
-
-# Сжатие в HEIC
-heif_file = heif_from_pillow(source_image)
-heif_file.save(
-    "output.heic",
-    quality=33
-)
-
-# Сжатие в AVIF
-source_image.save(
-    "output.avif",
-    quality=33
-)
-
-
-def compress_image(file_path, quality: int = 40, format: str = "avif") -> None:
+if __name__ == '__main__':
+    # Пример 1: Обход файловой системы
+
+    source_path = r"C:\Users\New\PycharmProjects\MyHomeworks"  # Путь к папке с изображениями
+
+    # # Вариант 1: Простой обход через listdir
+    # files = os.listdir(source_path)  # Получаем список файлов в директории
+    # for file in files:
+    #     full_path = os.path.join(source_path, file)  # Формируем полный путь
+    #     if os.path.isfile(full_path):  # Проверяем что это файл
+    #         print(f"Найден файл: {full_path}")
+    #
+    # # Вариант 2: Рекурсивный обход через walk
+    # for root, dirs, files in os.walk(source_path):  # root - текущая директория, dirs - папки, files - файлы
+    #     for file in files:
+    #         full_path = os.path.join(root, file)  # Формируем полный путь
+    #         print(f"Найден файл: {full_path}")
+
+    # Открываем изображение
+    # Исходное изображение
+    source_image = Image.open('Input.jpg')
+
+    # Сжатие в WEBP
+    source_image.save(
+        "output.webp",
+        format='WEBP',
+        quality=33
+    )
+
+    # Сжатие в HEIC
+    heif_file = heif_from_pillow(source_image)
+    heif_file.save(
+        "output.heic",
+        quality=33
+    )
+
+    # Сжатие в AVIF
+    source_image.save(
+        "output.avif",
+        quality=33
+    )
+
+
+RESPONSIVE_WIDTHS = (320, 640, 1280)
+
+
+def get_output_path(file_path: str, format: str, width: int | None = None) -> str:
+    """
+    Возвращает путь к сжатому изображению.
+
+    Параметры:
+        file_path (str): Путь к исходному файлу изображения
+        format (str): Выходной формат ('webp', 'avif', или 'heic')
+        width (int | None): Ширина уменьшенной копии (None - исходный размер), добавляется к имени файла
+    """
+    # Отрезаем от file_path .расширение - чтобы на выходе не получать file.png.webp
+    base_path = os.path.splitext(file_path)[0]
+    if width is not None:
+        base_path = f"{base_path}_{width}"
+    return f"{base_path}.{format}"
+
+
+def resize_variants(
+        image: Image.Image,
+        widths: tuple[int, ...] = RESPONSIVE_WIDTHS,
+        keep_original: bool = True,
+) -> dict[int | None, Image.Image]:
+    """
+    Создаёт уменьшенные копии изображения заданной ширины за одно декодирование.
+    Если исходный размер не нужен, JPEG декодируется сразу в уменьшенном виде
+    (draft - уменьшение в 2, 4 или 8 раз при декодировании DCT). Каждая копия
+    получается из предыдущей, большей: сначала быстрое уменьшение в целое число раз
+    (reduce), затем точное масштабирование LANCZOS. Изображения не увеличиваются.
+
+    Параметры:
+        image (Image.Image): Открытое, но ещё не загруженное изображение
+        widths (tuple[int, ...]): Ширины уменьшенных копий
+        keep_original (bool): Вернуть также изображение исходного размера
+
+    Возвращает словарь {ширина: изображение}, ключ None - исходный размер.
+    """
+    widths = sorted({width for width in widths if width < image.width}, reverse=True)
+    if not keep_original and widths and image.format == "JPEG":
+        image.draft(image.mode, (widths[0], math.ceil(image.height * widths[0] / image.width)))
+    image.load()
+
+    variants = {None: image} if keep_original else {}
+    source = image
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        source = source.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        variants[width] = source
+    return variants
+
+
+def compress_image(file_path, quality: int = 40, format: str = "avif") -> str:
     """
     Сжимает изображение в указанный формат с заданным качеством.
 
@@ -64,6 +122,8 @@ def compress_image(file_path, quality: int = 40, format: str = "avif") -> None:
         file_path (str): Путь к исходному файлу изображения
         quality (int): Качество сжатия (1-100), по умолчанию 40
         format (str): Выходной формат ('webp', 'avif', или 'heic')
+
+    Возвращает путь к сжатому изображению.
     """
     # Поддерживаемые форматы
     supported_formats = ["webp", "avif", "heic"]
@@ -72,16 +132,81 @@ def compress_image(file_path, quality: int = 40, format: str = "avif") -> None:
         raise ValueError(f"Формат {format} не поддерживается")
     # Открываем изображение
     image = Image.open(file_path)
-    # Отрезаем от file_path .расширение - чтобы на выходе не получать file.png.webp
-    file_path = file_path.split(".")[-2]
+    return save_image(image, get_output_path(file_path, format), quality, format)
+
+
+def save_image(image: Image.Image, output_path: str, quality: int, format: str) -> str:
+    """
+    Кодирует уже открытое изображение в указанный формат.
+
+    Параметры:
+        image (Image.Image): Изображение
+        output_path (str): Путь к сжатому изображению
+        quality (int): Качество сжатия (1-100)
+        format (str): Выходной формат ('webp', 'avif', или 'heic')
+
+    Возвращает путь к сжатому изображению.
+    """
     # Проверяем на avif webp
     if format in ["webp", "avif"]:
-        image.save(f"{file_path}.{format}", format=format, quality=quality)
-        return
-    if format == "heic":
+        image.save(output_path, format=format, quality=quality)
+    elif format == "heic":
         heif_file = heif_from_pillow(image)
-        heif_file.save(f"{file_path}.{format}", quality=quality)
-        return
+        heif_file.save(output_path, quality=quality)
+    return output_path
+
+
+def compress_image_variants(
+        file_path: str,
+        targets: list[tuple[str, int]],
+        workers: int | None = None,
+        widths: tuple[int, ...] = (),
+        include_original: bool = True,
+) -> list[str]:
+    """
+    Сжимает изображение сразу в несколько форматов, декодируя исходный файл один раз.
+    Кодирование в разные форматы выполняется в потоках: кодеки WEBP, AVIF и HEIC
+    отпускают GIL, поэтому форматы кодируются параллельно.
+    Если заданы widths, дополнительно сохраняются уменьшенные копии (см. resize_variants)
+    с шириной в имени файла: photo_640.webp. Без исходного размера (include_original=False)
+    JPEG декодируется сразу в уменьшенном виде, что заметно быстрее.
+
+    Параметры:
+        file_path (str): Путь к исходному файлу изображения
+        targets (list[tuple[str, int]]): Список пар (формат, качество), например [("webp", 40), ("avif", 35)]
+        workers (int | None): Количество потоков (по умолчанию - по потоку на формат)
+        widths (tuple[int, ...]): Ширины уменьшенных копий, например RESPONSIVE_WIDTHS
+        include_original (bool): Сохранять ли изображение исходного размера. Если изображение
+            уже всех widths, оно сохраняется в исходном размере в любом случае
+
+    Возвращает пути к сжатым изображениям: для исходного размера, затем для каждой ширины
+    по убыванию, внутри - в порядке targets.
+    """
+    # Поддерживаемые форматы
+    supported_formats = ["webp", "avif", "heic"]
+    formats = [format for format, _ in targets]
+    for format in formats:
+        if format not in supported_formats:
+            raise ValueError(f"Формат {format} не поддерживается")
+    if len(set(formats)) != len(formats):
+        raise ValueError("Каждый формат можно указать только один раз")
+    if not include_original and not widths:
+        raise ValueError("Без исходного размера нужно указать ширины widths")
+    if not targets:
+        return []
+
+    with Image.open(file_path) as image:
+        variants = resize_variants(image, widths, keep_original=include_original) or {None: image}
+        # Image.save записывает параметры в сам объект, поэтому каждый поток
+        # кодирует свою копию декодированного изображения
+        tasks = [
+            (variant if i == 0 else variant.copy(), get_output_path(file_path, format, width), quality, format)
+            for width, variant in variants.items()
+            for i, (format, quality) in enumerate(targets)
+        ]
+        with ThreadPoolExecutor(max_workers=workers or len(targets)) as executor:
+            futures = [executor.submit(save_image, *task) for task in tasks]
+            return [future.result() for future in futures]
 
 
 def get_images_paths(source_path: str, allowed_extensions: list[str]) -> list[str]:
@@ -111,16 +236,147 @@ def get_images_paths(source_path: str, allowed_extensions: list[str]) -> list[st
 
     return images
 
+MANIFEST_NAME = '.compress_manifest.jsonl'
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Вычисляет хеш содержимого файла, читая его частями.
+
+    Параметры:
+        file_path (str): Путь к файлу
+        chunk_size (int): Размер читаемой части в байтах
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: str) -> dict[str, dict]:
+    """
+    Загружает манифест сжатых изображений (JSON Lines). Для каждого исходного файла
+    хранятся размер, время изменения, хеш, качество, формат и путь к результату.
+    Если запись о файле встречается несколько раз, действует последняя.
+
+    Параметры:
+        manifest_path (str): Путь к файлу манифеста
+    """
+    manifest = {}
+    if not os.path.exists(manifest_path):
+        return manifest
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Недописанная строка после аварийного завершения
+                continue
+            manifest[(entry['input'], entry['format'])] = entry
+    return manifest
+
+
+def is_up_to_date(manifest: dict, file_path: str, quality: int, format: str, manifest_file=None) -> bool:
+    """
+    Проверяет, что изображение уже сжато с теми же параметрами и не менялось.
+    Хеш считается только если размер совпал, а время изменения - нет (например, после
+    копирования). Если содержимое не изменилось, в записи обновляется время изменения,
+    чтобы при следующих запусках хеш не считался снова.
+
+    Параметры:
+        manifest (dict): Манифест из load_manifest
+        file_path (str): Путь к исходному файлу изображения
+        quality (int): Качество сжатия
+        format (str): Выходной формат
+        manifest_file: Файл манифеста, открытый на добавление (для обновлённой записи)
+    """
+    entry = manifest.get((os.path.abspath(file_path), format))
+    if entry is None or entry['quality'] != quality or not os.path.exists(entry['output']):
+        return False
+    stat = os.stat(file_path)
+    if stat.st_size != entry['size']:
+        return False
+    if stat.st_mtime_ns == entry['mtime_ns']:
+        return True
+    if file_hash(file_path) != entry['hash']:
+        return False
+    entry['mtime_ns'] = stat.st_mtime_ns
+    if manifest_file is not None:
+        manifest_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        manifest_file.flush()
+    return True
+
+
+def update_manifest(manifest: dict, manifest_file, file_path: str, output_path: str, quality: int, format: str) -> None:
+    """
+    Добавляет запись о сжатом изображении в манифест и дописывает её в открытый файл манифеста.
+
+    Параметры:
+        manifest (dict): Манифест из load_manifest
+        manifest_file: Файл манифеста, открытый на добавление
+        file_path (str): Путь к исходному файлу изображения
+        output_path (str): Путь к сжатому изображению
+        quality (int): Качество сжатия
+        format (str): Выходной формат
+    """
+    stat = os.stat(file_path)
+    entry = {
+        'input': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': file_hash(file_path),
+        'quality': quality,
+        'format': format,
+        'output': os.path.abspath(output_path),
+    }
+    manifest[(entry['input'], format)] = entry
+    manifest_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    manifest_file.flush()
+
+
+def save_manifest(manifest: dict, manifest_path: str) -> None:
+    """
+    Перезаписывает манифест без устаревших записей.
+
+    Параметры:
+        manifest (dict): Манифест из load_manifest
+        manifest_path (str): Путь к файлу манифеста
+    """
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for entry in manifest.values():
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, manifest_path)
+
+
 def main() -> None:
     """
     Основная точка входа программы.
+    Уже сжатые и не изменившиеся изображения пропускаются (см. MANIFEST_NAME).
     """
     user_path = input('Введите путь к папке или файлу: ')
+    quality, format = 40, "webp"
 
     images = get_images_paths(user_path, ALLOWED_EXTENSIONS)
+    manifest_dir = user_path if os.path.isdir(user_path) else os.path.dirname(user_path)
+    manifest_path = os.path.join(manifest_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+
+    skipped = 0
+    with open(manifest_path, 'a', encoding='utf-8') as manifest_file:
+        manifest_size = manifest_file.tell()
+        for image in images:
+            if is_up_to_date(manifest, image, quality, format, manifest_file):
+                skipped += 1
+                continue
+            output_path = compress_image(image, quality=quality, format=format)
+            update_manifest(manifest, manifest_file, image, output_path, quality, format)
+        manifest_changed = manifest_file.tell() != manifest_size
 
-    for image in images:
-        compress_image(image, format="webp")
+    if manifest_changed:
+        save_manifest(manifest, manifest_path)
+    print(f'Сжато изображений: {len(images) - skipped}, без изменений: {skipped}')
 
 if __name__ == '__main__':
     main()
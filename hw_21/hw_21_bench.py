@@ -0,0 +1,108 @@
+"""
+Замер времени сжатия в несколько форматов: отдельные вызовы compress_image
+(исходный файл декодируется на каждый формат) и compress_image_variants
+(одно декодирование, кодирование в потоках), а также времени получения
+уменьшенных копий: resize() исходного изображения и resize_variants
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+from hw_21 import RESPONSIVE_WIDTHS, compress_image, compress_image_variants, resize_variants
+
+TARGETS = [("webp", 33), ("avif", 33), ("heic", 33)]
+
+
+def make_photo(file_path: str, megapixels: float = 12) -> None:
+    """
+    Создаёт тестовую JPEG-фотографию (градиент с шумом) заданного размера.
+
+    Параметры:
+        file_path (str): Путь к файлу
+        megapixels (float): Размер изображения в мегапикселях (соотношение сторон 3:2)
+    """
+    height = int((megapixels * 1_000_000 / 1.5) ** 0.5)
+    width = int(height * 1.5)
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    image = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    image.save(file_path, quality=90)
+
+
+def bench_variants(images_count: int = 5, megapixels: float = 12, targets: list[tuple[str, int]] = TARGETS) -> None:
+    """
+    Сравнение отдельных вызовов compress_image и compress_image_variants
+
+    Параметры:
+        images_count (int): Количество изображений
+        megapixels (float): Размер изображений в мегапикселях
+        targets (list[tuple[str, int]]): Список пар (формат, качество)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f'{i}.jpg') for i in range(images_count)]
+        for path in paths:
+            make_photo(path, megapixels)
+        print(f"{images_count} изображений по {megapixels} Мп, форматы: {', '.join(f for f, _ in targets)}")
+
+        start = time.perf_counter()
+        for path in paths:
+            for format, quality in targets:
+                compress_image(path, quality=quality, format=format)
+        separate = (time.perf_counter() - start) / images_count
+
+        start = time.perf_counter()
+        for path in paths:
+            compress_image_variants(path, targets)
+        variants = (time.perf_counter() - start) / images_count
+
+        print(f"{'compress_image x' + str(len(targets)):>24}: {separate:.2f} с на изображение")
+        print(f"{'compress_image_variants':>24}: {variants:.2f} с на изображение "
+              f"(экономия {separate - variants:.2f} с, x{separate / variants:.1f})")
+
+
+def bench_resize(images_count: int = 3, megapixels: float = 24, widths: tuple[int, ...] = RESPONSIVE_WIDTHS) -> None:
+    """
+    Сравнение получения копий исходного размера и заданной ширины:
+    отдельное декодирование и resize() с полного размера для каждой ширины,
+    resize_variants с исходным размером и resize_variants только с уменьшенными копиями (draft)
+
+    Параметры:
+        images_count (int): Количество изображений
+        megapixels (float): Размер изображений в мегапикселях
+        widths (tuple[int, ...]): Ширины уменьшенных копий
+    """
+    def naive(path: str) -> None:
+        with Image.open(path) as image:
+            image.load()
+        for width in widths:
+            with Image.open(path) as image:
+                image.resize((width, round(image.height * width / image.width)), Image.Resampling.LANCZOS)
+
+    def pipeline(path: str) -> None:
+        with Image.open(path) as image:
+            resize_variants(image, widths)
+
+    def pipeline_draft(path: str) -> None:
+        with Image.open(path) as image:
+            resize_variants(image, widths, keep_original=False)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f'{i}.jpg') for i in range(images_count)]
+        for path in paths:
+            make_photo(path, megapixels)
+        print(f"{images_count} изображений по {megapixels} Мп, ширины: {', '.join(map(str, widths))}")
+
+        for name, func in (('resize()', naive), ('resize_variants', pipeline), ('resize_variants draft', pipeline_draft)):
+            start = time.perf_counter()
+            for path in paths:
+                func(path)
+            elapsed = (time.perf_counter() - start) / images_count
+            print(f"{name:>24}: {elapsed:.2f} с на изображение")
+
+
+if __name__ == '__main__':
+    bench_variants(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
+    bench_resize()
@@ -0,0 +1,284 @@
+"""
+Массовое преобразование файлов между форматами CSV, JSON, JSON Lines и YAML.
+Формат определяется по расширению, файлы обрабатываются параллельно в пуле процессов.
+
+Пример запуска:
+    python files_convert.py data/ converted/ --to json --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import yaml
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Iterable, Iterator
+
+from files_utils import YAML_DUMPER, is_compressed, iter_csv, iter_jsonl, open_file, read_json, read_yaml
+
+
+FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+}
+
+
+def detect_format(file_path: str) -> str:
+    """
+    Функция для определения формата файла по расширению (суффикс сжатия .gz/.bz2/.xz пропускается)
+    :param file_path: Путь к файлу
+    :return: Название формата (csv, json, jsonl или yaml)
+    """
+    if is_compressed(file_path):
+        file_path = os.path.splitext(file_path)[0]
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f'Формат файла {file_path} не поддерживается')
+    return FORMATS[extension]
+
+
+def iter_records(file_path: str, delimiter=';', encoding: str = 'utf-8') -> Iterator[dict[Any, Any]]:
+    """
+    Генератор записей файла любого поддерживаемого формата.
+    CSV и JSON Lines читаются потоково, JSON и YAML - целиком
+    :param file_path: Путь к файлу
+    :param delimiter: Разделитель для CSV (по умолчанию ";")
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Записи файла по одной
+    """
+    file_format = detect_format(file_path)
+    if file_format == 'csv':
+        yield from iter_csv(file_path, delimiter=delimiter, encoding=encoding)
+    elif file_format == 'jsonl':
+        yield from iter_jsonl(file_path, encoding=encoding)
+    elif file_format == 'json':
+        yield from read_json(file_path, encoding=encoding)
+    else:
+        yield from read_yaml(file_path) or []
+
+
+def write_records(records: Iterable[dict], file_path: str, delimiter=';', encoding: str = 'utf-8') -> int:
+    """
+    Функция для записи записей в файл формата, определенного по расширению.
+    CSV, JSON и JSON Lines пишутся потоково, YAML - целиком
+    :param records: Записи
+    :param file_path: Путь к файлу
+    :param delimiter: Разделитель для CSV (по умолчанию ";")
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Количество записанных записей
+    """
+    file_format = detect_format(file_path)
+    count = 0
+    with open_file(file_path, 'w', encoding=encoding, newline='' if file_format == 'csv' else None) as f:
+        if file_format == 'csv':
+            writer = None
+            for count, record in enumerate(records, start=1):
+                if writer is None:
+                    writer = csv.DictWriter(f, delimiter=delimiter, fieldnames=record.keys())
+                    writer.writeheader()
+                writer.writerow(record)
+        elif file_format == 'jsonl':
+            for count, record in enumerate(records, start=1):
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        elif file_format == 'json':
+            f.write('[')
+            for count, record in enumerate(records, start=1):
+                if count > 1:
+                    f.write(', ')
+                json.dump(record, f, ensure_ascii=False)
+            f.write(']')
+        else:
+            data = list(records)
+            count = len(data)
+            yaml.dump(data, f, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False)
+    return count
+
+
+def make_result(source_path: str, target_path: str, error: str | None = None) -> dict[str, Any]:
+    """
+    Функция для создания словаря результата преобразования
+    :param source_path: Путь к исходному файлу
+    :param target_path: Путь к итоговому файлу
+    :param error: Текст ошибки (если была)
+    :return: Словарь с путями, количеством записей, размером, временем и ошибкой
+    """
+    return {'source': source_path, 'target': target_path, 'records': 0, 'bytes': 0, 'seconds': 0.0, 'error': error}
+
+
+def same_file(first_path: str, second_path: str) -> bool:
+    """
+    Функция для проверки, указывают ли два пути на один и тот же файл
+    :param first_path: Путь к первому файлу
+    :param second_path: Путь ко второму файлу
+    :return: True, если это один файл
+    """
+    if os.path.exists(first_path) and os.path.exists(second_path):
+        return os.path.samefile(first_path, second_path)
+    return os.path.normcase(os.path.abspath(first_path)) == os.path.normcase(os.path.abspath(second_path))
+
+
+def convert_file(source_path: str, target_path: str, delimiter=';', encoding: str = 'utf-8') -> dict[str, Any]:
+    """
+    Функция для преобразования одного файла. Ошибки не пробрасываются, а возвращаются в результате.
+    Запись идет во временный файл в итоговой директории, который затем атомарно заменяет итоговый,
+    поэтому при ошибке существующий итоговый файл не портится
+    :param source_path: Путь к исходному файлу
+    :param target_path: Путь к итоговому файлу
+    :param delimiter: Разделитель для CSV (по умолчанию ";")
+    :param encoding: Кодировка файлов (по умолчанию "utf-8")
+    :return: Словарь с путями, количеством записей, размером, временем и ошибкой (если была)
+    """
+    if same_file(source_path, target_path):
+        return make_result(source_path, target_path, 'ValueError: итоговый файл совпадает с исходным')
+    result = make_result(source_path, target_path)
+    start = time.perf_counter()
+    tmp_path = None
+    try:
+        target_dir = os.path.dirname(target_path) or '.'
+        os.makedirs(target_dir, exist_ok=True)
+        # Имя временного файла заканчивается именем итогового, чтобы формат и сжатие определялись так же
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix='.tmp_', suffix='_' + os.path.basename(target_path))
+        os.close(fd)
+        records = iter_records(source_path, delimiter=delimiter, encoding=encoding)
+        result['records'] = write_records(records, tmp_path, delimiter=delimiter, encoding=encoding)
+        os.replace(tmp_path, target_path)
+        tmp_path = None
+        result['bytes'] = os.path.getsize(source_path)
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def find_files(source_dir: str) -> list[str]:
+    """
+    Функция для рекурсивного поиска файлов поддерживаемых форматов
+    :param source_dir: Путь к директории
+    :return: Список путей к файлам
+    """
+    paths = []
+    for root, _, files in os.walk(source_dir):
+        for file in files:
+            try:
+                detect_format(file)
+            except ValueError:
+                continue
+            paths.append(os.path.join(root, file))
+    return paths
+
+
+def plan_targets(source_dir: str, target_dir: str, target_format: str) -> list[tuple[str, str, str | None]]:
+    """
+    Функция для сопоставления исходных файлов итоговым путям.
+    Если несколько исходных файлов (например, a.json и a.yaml) дают один итоговый путь,
+    ни один из них не преобразуется - иначе последний молча перезаписал бы остальные
+    :param source_dir: Путь к исходной директории
+    :param target_dir: Путь к итоговой директории
+    :param target_format: Итоговый формат
+    :return: Список кортежей (исходный путь, итоговый путь, ошибка или None)
+    """
+    plan = []
+    sources_by_target = {}
+    for source_path in find_files(source_dir):
+        relative_path = os.path.relpath(source_path, source_dir)
+        if is_compressed(relative_path):
+            relative_path = os.path.splitext(relative_path)[0]
+        relative_path = os.path.splitext(relative_path)[0]
+        target_path = os.path.join(target_dir, f'{relative_path}.{target_format}')
+        plan.append((source_path, target_path))
+        key = os.path.normcase(os.path.abspath(target_path))
+        sources_by_target.setdefault(key, []).append(source_path)
+
+    result = []
+    for source_path, target_path in plan:
+        sources = sources_by_target[os.path.normcase(os.path.abspath(target_path))]
+        error = None
+        if len(sources) > 1:
+            error = f'ValueError: итоговый файл совпадает для {", ".join(sorted(sources))}'
+        result.append((source_path, target_path, error))
+    return result
+
+
+def convert_tree(
+        source_dir: str,
+        target_dir: str,
+        target_format: str,
+        workers: int | None = None,
+        delimiter=';',
+        encoding: str = 'utf-8',
+) -> Iterator[dict[str, Any]]:
+    """
+    Генератор для параллельного преобразования всех файлов директории.
+    Структура поддиректорий сохраняется, в очереди пула одновременно не больше 2 * workers задач.
+    Файлы, совпадающие с итоговыми или конфликтующие по итоговому пути, не преобразуются и возвращаются с ошибкой
+    :param source_dir: Путь к исходной директории
+    :param target_dir: Путь к итоговой директории
+    :param target_format: Итоговый формат (csv, json, jsonl или yaml)
+    :param workers: Количество процессов (по умолчанию - количество ядер)
+    :param delimiter: Разделитель для CSV (по умолчанию ";")
+    :param encoding: Кодировка файлов (по умолчанию "utf-8")
+    :return: Результаты convert_file по мере готовности
+    """
+    if target_format not in FORMATS.values():
+        raise ValueError(f'Формат {target_format} не поддерживается')
+    workers = workers or os.cpu_count() or 1
+    plan = iter(plan_targets(source_dir, target_dir, target_format))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        while True:
+            for source_path, target_path, error in plan:
+                if error is None and same_file(source_path, target_path):
+                    error = 'ValueError: итоговый файл совпадает с исходным'
+                if error is not None:
+                    yield make_result(source_path, target_path, error)
+                    continue
+                pending.add(executor.submit(convert_file, source_path, target_path, delimiter, encoding))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main() -> None:
+    """
+    Точка входа для запуска из командной строки
+    """
+    parser = argparse.ArgumentParser(description='Массовое преобразование CSV/JSON/JSONL/YAML файлов')
+    parser.add_argument('source', help='Исходная директория')
+    parser.add_argument('target', help='Итоговая директория')
+    parser.add_argument('--to', dest='target_format', required=True, choices=sorted(set(FORMATS.values())))
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов')
+    parser.add_argument('--delimiter', default=';', help='Разделитель для CSV')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files_count = errors_count = records_count = 0
+    for result in convert_tree(args.source, args.target, args.target_format, args.workers, args.delimiter):
+        files_count += 1
+        if result['error']:
+            errors_count += 1
+            print(f'Ошибка: {result["source"]}: {result["error"]}')
+            continue
+        records_count += result['records']
+        speed = result['bytes'] / 2 ** 20 / result['seconds'] if result['seconds'] else 0
+        print(f'{result["source"]} -> {result["target"]}: {result["records"]} записей, '
+              f'{result["seconds"]:.3f} с, {speed:.1f} МБ/с')
+
+    elapsed = time.perf_counter() - start
+    print(f'Готово: {files_count} файлов ({errors_count} с ошибками), {records_count} записей за {elapsed:.2f} с')
+
+
+if __name__ == '__main__':
+    main()
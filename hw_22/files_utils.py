@@ -1,87 +1,432 @@
-import json
+import bz2
 import csv
+import gzip
+import io
+import json
+import lzma
+import math
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
 import yaml
 
-from typing import Any
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, Any, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    import msvcrt
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Открытие файлов с прозрачным сжатием (.gz, .bz2, .xz)
+
+COMPRESSION_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def is_compressed(file_path: str) -> bool:
+    """
+    Функция для проверки, является ли файл сжатым (по расширению)
+    :param file_path: Путь к файлу
+    :return: True для .gz, .bz2 и .xz файлов
+    """
+    return os.path.splitext(file_path)[1].lower() in COMPRESSION_OPENERS
+
+
+def open_file(
+        file_path: str,
+        mode: str = 'r',
+        encoding: str = 'utf-8',
+        newline: str | None = None,
+        compresslevel: int | None = None,
+) -> IO:
+    """
+    Функция для открытия текстового файла. Сжатые файлы распаковываются/сжимаются на лету
+    :param file_path: Путь к файлу
+    :param mode: Режим: "r", "w" или "a"
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param newline: Параметр newline, как у open
+    :param compresslevel: Уровень сжатия при записи (по умолчанию - стандартный для алгоритма)
+    :return: Открытый файловый объект
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in COMPRESSION_OPENERS:
+        return open(file_path, mode, encoding=encoding, newline=newline)
+
+    kwargs = {}
+    if compresslevel is not None and mode != 'r':
+        kwargs['preset' if extension == '.xz' else 'compresslevel'] = compresslevel
+    return COMPRESSION_OPENERS[extension](file_path, mode + 't', encoding=encoding, newline=newline, **kwargs)
+
+
+
+# Кэш разобранных JSON/YAML файлов (по умолчанию выключен, включается enable_parse_cache)
+
+class ParseCache:
+    """
+    LRU-кэш разобранного содержимого файлов.
+    Ключ - (путь, вид разбора, кодировка, mtime_ns, размер), поэтому измененный файл
+    автоматически перечитывается. Значения хранятся в сериализованном (pickle) виде,
+    и при каждом обращении возвращается новая копия, поэтому вызывающий код может
+    свободно изменять и записывать полученные данные, не портя кэш
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[bool, Any]:
+        """
+        Метод для получения значения из кэша
+        :param key: Ключ
+        :return: (найдено ли значение, значение)
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key][0]
+
+    def put(self, key: tuple, value: Any, size: int) -> None:
+        """
+        Метод для добавления значения в кэш с вытеснением давно не использованных записей
+        :param key: Ключ
+        :param value: Значение
+        :param size: Размер значения в байтах
+        :return: None
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # Устаревшие версии того же файла больше не понадобятся
+            for old_key in [k for k in self._entries if k[:3] == key[:3]]:
+                self._total_bytes -= self._entries.pop(old_key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.evictions += 1
 
+    def clear(self) -> None:
+        """
+        Метод для очистки кэша и счетчиков
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Метод для получения статистики кэша
+        :return: Словарь со счетчиками попаданий, промахов, вытеснений и текущим размером
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+
+
+_parse_cache: ParseCache | None = None
+
+
+def enable_parse_cache(max_entries: int = 128, max_bytes: int = 64 * 2 ** 20) -> ParseCache:
+    """
+    Функция для включения кэша разобранных файлов для read_json и read_yaml
+    :param max_entries: Максимальное количество файлов в кэше (по умолчанию 128)
+    :param max_bytes: Максимальный суммарный размер сериализованных данных в кэше (по умолчанию 64 МБ)
+    :return: Объект кэша
+    """
+    global _parse_cache
+    _parse_cache = ParseCache(max_entries=max_entries, max_bytes=max_bytes)
+    return _parse_cache
+
+
+def disable_parse_cache() -> None:
+    """
+    Функция для выключения кэша разобранных файлов
+    :return: None
+    """
+    global _parse_cache
+    _parse_cache = None
+
+
+def get_parse_cache_stats() -> dict[str, int]:
+    """
+    Функция для получения статистики кэша разобранных файлов
+    :return: Словарь со счетчиками (пустой, если кэш выключен)
+    """
+    return _parse_cache.stats() if _parse_cache is not None else {}
+
+
+def _load_cached(file_path: str, loader: Callable[[IO], Any], kind: str, encoding: str) -> Any:
+    """
+    Функция для чтения и разбора файла с использованием кэша (если он включен)
+    :param file_path: Путь к файлу
+    :param loader: Функция разбора открытого файла
+    :param kind: Вид разбора (часть ключа кэша)
+    :param encoding: Кодировка файла
+    :return: Разобранные данные
+    """
+    cache = _parse_cache
+    if cache is None:
+        with open_file(file_path, encoding=encoding) as f:
+            return loader(f)
+
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), kind, encoding, stat.st_mtime_ns, stat.st_size)
+    found, data = cache.get(key)
+    if found:
+        return pickle.loads(data)
+    with open_file(file_path, encoding=encoding) as f:
+        value = loader(f)
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    cache.put(key, data, len(data))
+    return value
 
 
 # Функции для работы с JSON файлами
 
 def read_json(file_path: str, encoding: str = 'utf-8') -> list[dict[Any, Any]]:
     """
-    Функция для чтения json файла
+    Функция для чтения json файла.
+    Если включен кэш (enable_parse_cache), повторное чтение неизмененного файла не разбирает его заново
     :param file_path: Путь к файлу
     :param encoding: Кодировка файла (по умолчанию "utf-8")
     :return: Данные в виде словаря, считанные из файла
     """
     try:
-        with open(file_path, encoding=encoding) as f:
-            return json.load(f)
+        return _load_cached(file_path, json.load, 'json', encoding)
     except FileNotFoundError:
         print(f'Файл {file_path} не найден')
         return []
 
 
-def write_json(*data: dict, file_path: str, encoding: str = 'utf-8') -> None:
+def write_json(*data: dict, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для записи данных в json файл
     :param data: Данные для записи
     :param file_path: Путь к файлу
     :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return: None
     """
-    with open(file_path, 'w', encoding=encoding) as f:
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
         json.dump(data, f, ensure_ascii=False)
 
 
-def append_json(*data: dict, file_path: str, encoding: str = 'utf-8') -> None:
+def append_json(*data: dict, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для добавления данных в json файл
     :param data: Данные для записи
     :param file_path: Путь к файлу
     :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return: None
     """
     try:
-        with open(file_path, encoding=encoding) as f:
+        with open_file(file_path, encoding=encoding) as f:
             old_data = json.load(f)
     except FileNotFoundError:
-        return write_json(*data, file_path=file_path, encoding=encoding)
+        return write_json(*data, file_path=file_path, encoding=encoding, compresslevel=compresslevel)
 
     new_data = [*old_data, *data]
-    write_json(*new_data, file_path=file_path, encoding=encoding)
+    write_json(*new_data, file_path=file_path, encoding=encoding, compresslevel=compresslevel)
+
+
+# Функции для работы с JSON Lines файлами (одна запись - одна строка)
+
+def iter_jsonl(file_path: str, encoding: str = 'utf-8') -> Iterator[dict[Any, Any]]:
+    """
+    Генератор для построчного чтения jsonl файла
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Записи файла по одной
+    """
+    try:
+        with open_file(file_path, encoding=encoding) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except FileNotFoundError:
+        print(f'Файл {file_path} не найден')
+
+
+def read_jsonl(file_path: str, encoding: str = 'utf-8') -> list[dict[Any, Any]]:
+    """
+    Функция для чтения jsonl файла
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Данные в виде списка, считанные из файла
+    """
+    return list(iter_jsonl(file_path, encoding=encoding))
+
+
+def write_jsonl(*data: dict, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для записи данных в jsonl файл
+    :param data: Данные для записи
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
+        f.writelines(json.dumps(item, ensure_ascii=False) + '\n' for item in data)
+
+
+def append_jsonl(*data: dict, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для добавления данных в jsonl файл.
+    В отличие от append_json файл не перечитывается - новые записи дописываются в конец
+    :param data: Данные для записи
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(file_path, 'a', encoding=encoding, compresslevel=compresslevel) as f:
+        f.writelines(json.dumps(item, ensure_ascii=False) + '\n' for item in data)
+
+
+def jsonl_to_json(jsonl_path: str, json_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для преобразования jsonl файла в обычный json массив (для read_json).
+    Записи переносятся по одной, поэтому весь файл в память не загружается
+    :param jsonl_path: Путь к исходному jsonl файлу
+    :param json_path: Путь к итоговому json файлу
+    :param encoding: Кодировка файлов (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(json_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
+        f.write('[')
+        for i, item in enumerate(iter_jsonl(jsonl_path, encoding=encoding)):
+            if i:
+                f.write(', ')
+            json.dump(item, f, ensure_ascii=False)
+        f.write(']')
+
+
+def json_to_jsonl(json_path: str, jsonl_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для преобразования json массива в jsonl файл
+    :param json_path: Путь к исходному json файлу
+    :param jsonl_path: Путь к итоговому jsonl файлу
+    :param encoding: Кодировка файлов (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(json_path, encoding=encoding) as f:
+        data = json.load(f)
+    write_jsonl(*data, file_path=jsonl_path, encoding=encoding, compresslevel=compresslevel)
 
 
 # Функции для работы с CSV файлами
 
-def read_csv(file_path: str, delimiter=';', encoding: str = 'utf-8') -> list[dict[Any, Any]]:
+def iter_csv(
+        file_path: str,
+        batch_size: int | None = None,
+        delimiter=';',
+        encoding: str = 'utf-8',
+        schema: dict[str, type] | str | None = None,
+) -> Iterator[dict[Any, Any]] | Iterator[list[dict[Any, Any]]]:
     """
-    Функция для чтения csv файла
+    Генератор для потокового чтения csv файла.
+    В памяти одновременно находится только одна строка (или одна пачка строк)
     :param file_path: Путь к файлу
+    :param batch_size: Размер пачки. Если не указан - строки отдаются по одной,
+        иначе - списками не длиннее batch_size
     :param delimiter: Разделитель (по умолчанию ";")
     :param encoding: Кодировка файла (по умолчанию "utf-8")
-    :return: Данные в виде списка, считанные из файла
+    :param schema: Типы колонок {колонка: тип} (int, float, date, datetime или str),
+        "infer" - определить по первым строкам файла, None - все значения остаются строками.
+        Пустые значения в нестроковых колонках становятся None. Если значение не приводится
+        к типу колонки, выбрасывается ValueError с номером строки и колонкой
+    :return: Строки файла в виде словарей или списки таких словарей
     """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError('batch_size должен быть положительным числом')
     try:
-        with open(file_path, encoding=encoding) as f:
+        if schema == 'infer':
+            schema = infer_csv_schema(file_path, delimiter=delimiter, encoding=encoding)
+        converters = make_csv_converters(schema) if schema else []
+        with open_file(file_path, encoding=encoding) as f:
             reader = csv.DictReader(f, delimiter=delimiter)
-            return list(reader)
+            if converters:
+                rows = reader
+                reader = (convert_csv_row(row, converters, rows.line_num) for row in rows)
+            if batch_size is None:
+                yield from reader
+                return
+            while batch := list(islice(reader, batch_size)):
+                yield batch
     except FileNotFoundError:
         print(f'Файл {file_path} не найден')
-        return []
 
 
-def write_csv(*data: dict, file_path: str, delimiter=';', encoding: str = 'utf-8') -> None:
+def read_csv(file_path: str, delimiter=';', encoding: str = 'utf-8',
+        schema: dict[str, type] | str | None = None) -> list[dict[Any, Any]]:
+    """
+    Функция для чтения csv файла
+    :param file_path: Путь к файлу
+    :param delimiter: Разделитель (по умолчанию ";")
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param schema: Типы колонок, "infer" или None (см. iter_csv)
+    :return: Данные в виде списка, считанные из файла
+    """
+    return list(iter_csv(file_path, delimiter=delimiter, encoding=encoding, schema=schema))
+
+
+def write_csv(*data: dict, file_path: str, delimiter=';', encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для записи данных в csv файл
     :param data: Данные для записи
     :param file_path: Путь к файлу
     :param delimiter: Разделитель (по умолчанию ";")
     :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return: None
     """
-    with (open(file_path, 'w', encoding=encoding) as f):
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
         writer = csv.DictWriter(
             f,
             delimiter=delimiter,
@@ -91,22 +436,190 @@ def write_csv(*data: dict, file_path: str, delimiter=';', encoding: str = 'utf-8
         writer.writerows(data)
 
 
-def append_csv(*data: dict, file_path: str, delimiter=';', encoding: str = 'utf-8') -> None:
+def append_csv(*data: dict, file_path: str, delimiter=';', encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для добавления данных в csv файл
     :param data: Данные для записи
     :param file_path: Путь к файлу
     :param delimiter: Разделитель (по умолчанию ";")
     :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return: None
     """
-    with open(file_path, mode='a', encoding=encoding) as f:
+    with open_file(file_path, 'a', encoding=encoding, compresslevel=compresslevel) as f:
         csv.DictWriter(
             f,
             delimiter=delimiter,
             fieldnames=data[0].keys(),
         ).writerows(data)
 
+# Типизированное чтение CSV файлов: определение схемы, преобразователи значений
+# и загрузка по колонкам в компактные массивы
+
+CSV_CONVERTERS = {
+    int: int,
+    float: float,
+    date: date.fromisoformat,
+    datetime: datetime.fromisoformat,
+}
+CSV_COLUMN_TYPECODES = {int: 'q', float: 'd'}
+
+
+def detect_csv_value_type(value: str) -> type:
+    """
+    Функция для определения самого узкого типа строкового значения
+    :param value: Значение
+    :return: int, float, date, datetime или str
+    """
+    for value_type, convert in CSV_CONVERTERS.items():
+        try:
+            convert(value)
+        except (TypeError, ValueError):
+            continue
+        return value_type
+    return str
+
+
+def merge_csv_types(first: type, second: type) -> type:
+    """
+    Функция для определения общего типа колонки по типам двух значений
+    :param first: Первый тип
+    :param second: Второй тип
+    :return: Общий тип: int + float -> float, date + datetime -> datetime, остальное -> str
+    """
+    if first is second:
+        return first
+    for wider, narrower in ((float, int), (datetime, date)):
+        if {first, second} == {wider, narrower}:
+            return wider
+    return str
+
+
+def infer_csv_schema(
+        file_path: str,
+        sample_size: int = 1000,
+        delimiter=';',
+        encoding: str = 'utf-8',
+) -> dict[str, type]:
+    """
+    Функция для определения типов колонок csv файла по первым строкам.
+    Пустые значения не учитываются
+    :param file_path: Путь к файлу
+    :param sample_size: Количество строк для анализа (по умолчанию 1000)
+    :param delimiter: Разделитель (по умолчанию ";")
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Словарь {колонка: тип}, где тип - int, float, date, datetime или str
+    """
+    schema = {}
+    for row in islice(iter_csv(file_path, delimiter=delimiter, encoding=encoding), sample_size):
+        for column, value in row.items():
+            if column not in schema:
+                schema[column] = None
+            if value and schema[column] is not str:
+                value_type = detect_csv_value_type(value)
+                schema[column] = value_type if schema[column] is None else merge_csv_types(schema[column], value_type)
+    return {column: column_type or str for column, column_type in schema.items()}
+
+
+def make_csv_converters(schema: dict[str, type]) -> list[tuple[str, Callable[[str], Any]]]:
+    """
+    Функция для построения списка преобразователей по схеме.
+    Строковые колонки в список не попадают и не обрабатываются
+    :param schema: Словарь {колонка: тип}
+    :return: Список пар (колонка, функция преобразования)
+    """
+    converters = []
+    for column, column_type in schema.items():
+        if column_type is str:
+            continue
+        if column_type not in CSV_CONVERTERS:
+            raise ValueError(f'Тип {column_type} колонки {column} не поддерживается')
+        converters.append((column, CSV_CONVERTERS[column_type]))
+    return converters
+
+
+def convert_csv_row(
+        row: dict[str, Any],
+        converters: list[tuple[str, Callable[[str], Any]]],
+        line_number: int | None = None,
+) -> dict[str, Any]:
+    """
+    Функция для преобразования значений строки csv файла на месте.
+    Если значение не приводится к типу колонки, выбрасывается ValueError с номером строки и колонкой
+    :param row: Строка в виде словаря
+    :param converters: Преобразователи из make_csv_converters
+    :param line_number: Номер строки в файле (для сообщения об ошибке)
+    :return: Та же строка с преобразованными значениями (пустые значения -> None)
+    """
+    for column, convert in converters:
+        value = row[column]
+        try:
+            row[column] = convert(value) if value else None
+        except (TypeError, ValueError):
+            position = f'Строка {line_number}: ' if line_number is not None else ''
+            raise ValueError(f'{position}значение {value!r} в колонке {column} не приводится к типу колонки') from None
+    return row
+
+
+def read_csv_columns(
+        file_path: str,
+        schema: dict[str, type] | None = None,
+        use_numpy: bool = True,
+        delimiter=';',
+        encoding: str = 'utf-8',
+) -> dict[str, Any]:
+    """
+    Функция для чтения csv файла по колонкам.
+    Числовые колонки хранятся в array.array (или numpy.ndarray, если NumPy установлен),
+    поэтому не создается отдельный объект Python на каждое значение.
+    Пустые значения: в колонках float - NaN, колонка int с пустыми значениями
+    становится float с NaN, в колонках date и datetime - None
+    :param file_path: Путь к файлу
+    :param schema: Словарь {колонка: тип} (int, float, date, datetime или str). Если не указан - определяется
+        по первым строкам файла. Колонки, которых нет в схеме, не загружаются
+    :param use_numpy: Возвращать числовые колонки как numpy.ndarray (по умолчанию True)
+    :param delimiter: Разделитель (по умолчанию ";")
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Словарь {колонка: массив значений}
+    """
+    if schema is None:
+        schema = infer_csv_schema(file_path, delimiter=delimiter, encoding=encoding)
+
+    columns = {
+        column: array(CSV_COLUMN_TYPECODES[column_type]) if column_type in CSV_COLUMN_TYPECODES else []
+        for column, column_type in schema.items()
+    }
+    converters = [
+        [column, schema[column], CSV_CONVERTERS.get(schema[column], str), columns[column].append]
+        for column in schema
+    ]
+    for line_number, row in enumerate(iter_csv(file_path, delimiter=delimiter, encoding=encoding), start=2):
+        for converter in converters:
+            column, column_type, convert, append = converter
+            value = row[column]
+            if not value and column_type is not str:
+                if column_type is int:
+                    # В массиве int нельзя хранить пропуск, колонка переводится в float
+                    columns[column] = array(CSV_COLUMN_TYPECODES[float], columns[column])
+                    converter[1:] = float, float, columns[column].append
+                    column_type, append = float, columns[column].append
+                append(math.nan if column_type is float else None)
+                continue
+            try:
+                append(value if column_type is str else convert(value))
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f'Строка {line_number}: значение {row[column]!r} в колонке {column} '
+                    f'не приводится к типу {column_type.__name__}'
+                ) from None
+
+    if use_numpy and np is not None:
+        for column, values in columns.items():
+            if isinstance(values, array):
+                columns[column] = np.frombuffer(values, dtype=values.typecode)
+    return columns
+
 # Функции для работы с TXT файлами
 
 def read_txt(file_path: str, encoding: str = 'utf-8') -> list[str]:
@@ -117,45 +630,414 @@ def read_txt(file_path: str, encoding: str = 'utf-8') -> list[str]:
     :return:
     """
     try:
-        with open(file_path, encoding=encoding) as f:
+        with open_file(file_path, encoding=encoding) as f:
             return f.readlines()
     except FileNotFoundError:
         print(f'Файл {file_path} не найден')
         return []
 
 
-def write_txt(*data: str, file_path: str, encoding: str = 'utf-8') -> None:
+def write_txt(*data: str, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для записи данных в txt файл
     :param data:
     :param file_path:
     :param encoding:
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return:
     """
-    with open(file_path, 'w', encoding=encoding) as f:
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
         f.write('\n'.join(data))
 
 
-def append_txt(*data: str, file_path: str, encoding: str = 'utf-8') -> None:
+def append_txt(*data: str, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
     """
     Функция для добавления данных в txt файл
     :param data:
     :param file_path:
     :param encoding:
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
     :return:
     """
     try:
-        with open(file_path, 'a', encoding=encoding) as f:
+        with open_file(file_path, 'a', encoding=encoding, compresslevel=compresslevel) as f:
             f.write('\n' + '\n'.join(data))
     except FileNotFoundError:
-        write_txt(*data, file_path=file_path, encoding=encoding)
+        write_txt(*data, file_path=file_path, encoding=encoding, compresslevel=compresslevel)
+
+# Буферизированное добавление данных в CSV/TXT файлы
+
+FSYNC_POLICIES = ('never', 'on_close', 'every_n')
+
+
+def _lock_file(f: IO) -> None:
+    """
+    Функция для установки эксклюзивной межпроцессной блокировки открытого файла
+    :param f: Открытый файл
+    :return: None
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock_file(f: IO) -> None:
+    """
+    Функция для снятия блокировки, установленной _lock_file
+    :param f: Открытый файл
+    :return: None
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class BufferedAppender:
+    """
+    Контекстный менеджер для частого добавления данных в CSV/TXT файл.
+    Данные накапливаются в памяти и записываются одной операцией, когда буфер
+    превышает buffer_size или с последней записи прошло больше flush_interval секунд
+    (проверяется при вызове add). Запись выполняется под файловой блокировкой,
+    поэтому несколько процессов могут дописывать один и тот же файл.
+
+    Пример:
+        with BufferedAppender('log.csv', file_type='csv') as appender:
+            for row in rows:
+                appender.add(row)
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            file_type: str = 'txt',
+            buffer_size: int = 64 * 1024,
+            flush_interval: float = 1.0,
+            fsync: str = 'on_close',
+            fsync_every: int = 1,
+            use_lock: bool = True,
+            delimiter=';',
+            encoding: str = 'utf-8',
+    ):
+        """
+        :param file_path: Путь к файлу
+        :param file_type: Тип файла: "txt" (как append_txt) или "csv" (как append_csv)
+        :param buffer_size: Размер буфера в символах, после которого данные записываются в файл
+        :param flush_interval: Максимальное время хранения данных в буфере в секундах
+        :param fsync: Политика fsync: "never", "on_close" или "every_n" (каждые fsync_every записей)
+        :param fsync_every: Через сколько записей в файл вызывать fsync для политики "every_n"
+        :param use_lock: Использовать ли межпроцессную блокировку файла
+        :param delimiter: Разделитель для CSV (по умолчанию ";")
+        :param encoding: Кодировка файла (по умолчанию "utf-8")
+        """
+        if is_compressed(file_path):
+            raise ValueError('BufferedAppender не поддерживает сжатые файлы')
+        if file_type not in ('txt', 'csv'):
+            raise ValueError(f'Тип файла {file_type} не поддерживается')
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'Политика fsync должна быть одной из {FSYNC_POLICIES}')
+        if fsync_every < 1:
+            raise ValueError('fsync_every должен быть положительным числом')
+        self.file_path = file_path
+        self.file_type = file_type
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self.use_lock = use_lock
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self._buffer = io.StringIO()
+        self._fieldnames = None
+        self._file = None
+        self._flushes = 0
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> 'BufferedAppender':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Метод для открытия файла
+        :return: None
+        """
+        if self._file is None:
+            self._file = open(self.file_path, 'a', encoding=self.encoding, newline='')
+            self._last_flush = time.monotonic()
+
+    def add(self, *data: dict | str) -> None:
+        """
+        Метод для добавления данных в буфер
+        :param data: Строки (для txt) или словари (для csv)
+        :return: None
+        """
+        if not data:
+            return
+        if self.file_type == 'txt':
+            self._buffer.write('\n' + '\n'.join(data))
+        else:
+            if self._fieldnames is None:
+                self._fieldnames = list(data[0].keys())
+            csv.DictWriter(self._buffer, delimiter=self.delimiter, fieldnames=self._fieldnames).writerows(data)
+
+        if (self._buffer.tell() >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Метод для записи содержимого буфера в файл
+        :return: None
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer.tell():
+            return
+        self.open()
+        chunk = self._buffer.getvalue()
+        self._buffer = io.StringIO()
+
+        if self.use_lock:
+            _lock_file(self._file)
+        try:
+            self._file.seek(0, os.SEEK_END)
+            if self.file_type == 'csv' and not self._file.tell():
+                header = io.StringIO()
+                csv.DictWriter(header, delimiter=self.delimiter, fieldnames=self._fieldnames).writeheader()
+                chunk = header.getvalue() + chunk
+            self._file.write(chunk)
+            self._file.flush()
+            self._flushes += 1
+            if self.fsync == 'every_n' and self._flushes % self.fsync_every == 0:
+                os.fsync(self._file.fileno())
+        finally:
+            if self.use_lock:
+                _unlock_file(self._file)
+
+    def close(self) -> None:
+        """
+        Метод для записи оставшихся данных и закрытия файла
+        :return: None
+        """
+        if self._file is None:
+            return
+        try:
+            self.flush()
+            if self.fsync != 'never':
+                os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            self._file = None
+
+# Функции для произвольного доступа к строкам больших TXT файлов.
+# Рядом с файлом хранится индекс <file_path>.idx: заголовок (mtime_ns, размер файла),
+# затем смещения начала каждой строки и смещение конца файла (int64).
+# Индекс перестраивается, если файл изменился.
+
+TXT_INDEX_HEADER = struct.Struct('<qq')
+TXT_INDEX_ITEM_SIZE = 8
+TXT_INDEX_CHUNK = 1 << 20
+
+
+def build_txt_index(file_path: str) -> str:
+    """
+    Функция для построения индекса строк txt файла
+    :param file_path: Путь к файлу
+    :return: Путь к файлу индекса
+    """
+    if is_compressed(file_path):
+        raise ValueError('Индекс строк не поддерживается для сжатых файлов')
+    index_path = file_path + '.idx'
+    stat = os.stat(file_path)
+    with open(file_path, 'rb') as f, open(index_path, 'wb') as index:
+        index.write(TXT_INDEX_HEADER.pack(stat.st_mtime_ns, stat.st_size))
+        if not stat.st_size:
+            array('q', [0]).tofile(index)
+            return index_path
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offsets = array('q', [0])
+            position = mm.find(b'\n')
+            while position != -1:
+                if position + 1 < stat.st_size:
+                    offsets.append(position + 1)
+                if len(offsets) >= TXT_INDEX_CHUNK:
+                    offsets.tofile(index)
+                    offsets = array('q')
+                position = mm.find(b'\n', position + 1)
+            offsets.append(stat.st_size)
+            offsets.tofile(index)
+    return index_path
+
+
+def _get_txt_index(file_path: str) -> str:
+    """
+    Функция возвращает путь к актуальному индексу строк, при необходимости перестраивая его
+    :param file_path: Путь к файлу
+    :return: Путь к файлу индекса
+    """
+    index_path = file_path + '.idx'
+    stat = os.stat(file_path)
+    try:
+        with open(index_path, 'rb') as index:
+            header = index.read(TXT_INDEX_HEADER.size)
+        if header == TXT_INDEX_HEADER.pack(stat.st_mtime_ns, stat.st_size):
+            return index_path
+    except FileNotFoundError:
+        pass
+    return build_txt_index(file_path)
+
+
+def count_txt_lines(file_path: str) -> int:
+    """
+    Функция для подсчета количества строк txt файла по индексу
+    :param file_path: Путь к файлу
+    :return: Количество строк
+    """
+    index_size = os.path.getsize(_get_txt_index(file_path))
+    return (index_size - TXT_INDEX_HEADER.size) // TXT_INDEX_ITEM_SIZE - 1
+
+
+def get_lines(file_path: str, start: int, stop: int, encoding: str = 'utf-8') -> list[str]:
+    """
+    Функция для чтения строк файла с start по stop (не включая stop).
+    Результат совпадает с read_txt(file_path)[start:stop], но читаются только нужные байты
+    :param file_path: Путь к файлу
+    :param start: Номер первой строки (с нуля)
+    :param stop: Номер строки, перед которой чтение заканчивается
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Список строк
+    """
+    try:
+        lines_count = count_txt_lines(file_path)
+    except FileNotFoundError:
+        print(f'Файл {file_path} не найден')
+        return []
+
+    start = max(0, min(start, lines_count))
+    stop = max(start, min(stop, lines_count))
+    if start == stop:
+        return []
+
+    offsets = array('q')
+    with open(file_path + '.idx', 'rb') as index:
+        index.seek(TXT_INDEX_HEADER.size + start * TXT_INDEX_ITEM_SIZE)
+        offsets.fromfile(index, stop - start + 1)
+
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [
+            mm[begin:end].decode(encoding).replace('\r\n', '\n')
+            for begin, end in zip(offsets, offsets[1:])
+        ]
+
+
+def get_line(file_path: str, line_number: int, encoding: str = 'utf-8') -> str:
+    """
+    Функция для чтения одной строки файла по ее номеру
+    :param file_path: Путь к файлу
+    :param line_number: Номер строки (с нуля)
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Строка файла
+    """
+    if line_number < 0:
+        raise IndexError('Номер строки не может быть отрицательным')
+    lines = get_lines(file_path, line_number, line_number + 1, encoding=encoding)
+    if not lines and os.path.exists(file_path):
+        raise IndexError(f'В файле {file_path} нет строки {line_number}')
+    return lines[0] if lines else ''
+
+
+def tail_txt(file_path: str, lines_count: int = 10, encoding: str = 'utf-8') -> list[str]:
+    """
+    Функция для чтения последних строк файла
+    :param file_path: Путь к файлу
+    :param lines_count: Количество строк (по умолчанию 10)
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Список строк
+    """
+    try:
+        total = count_txt_lines(file_path)
+    except FileNotFoundError:
+        print(f'Файл {file_path} не найден')
+        return []
+    return get_lines(file_path, total - lines_count, total, encoding=encoding)
+
+# Функции для работы с YAML.
+# Если PyYAML собран с libyaml, используются C-реализации загрузчика и выгрузчика
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
-# Функция для работы с YAML
+def _load_yaml(f: IO) -> Any:
+    """
+    Функция для разбора одного YAML документа из открытого файла
+    :param f: Открытый файл
+    :return: Разобранные данные
+    """
+    return yaml.load(f, Loader=YAML_LOADER)
 
-def read_yaml(file_path: str) -> list[dict[str, Any]]:
+
+def read_yaml(file_path: str, encoding: str = 'utf-8') -> list[dict[str, Any]]:
+    """
+    Функция для чтения yaml файла с одним документом
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Данные, считанные из файла
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return _load_cached(file_path, _load_yaml, 'yaml', encoding)
     except FileNotFoundError:
         print(f'Файл {file_path} не найден')
         return []
+
+
+def iter_yaml(file_path: str, encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Генератор для чтения yaml файла из нескольких документов (разделенных "---").
+    Документы разбираются по одному по мере чтения
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :return: Документы по одному
+    """
+    try:
+        with open_file(file_path, encoding=encoding) as f:
+            yield from yaml.load_all(f, Loader=YAML_LOADER)
+    except FileNotFoundError:
+        print(f'Файл {file_path} не найден')
+
+
+def write_yaml(*data: dict, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для записи данных в yaml файл одним документом (списком)
+    :param data: Данные для записи
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
+        yaml.dump(list(data), f, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False)
+
+
+def write_yaml_documents(*documents: Any, file_path: str, encoding: str = 'utf-8',
+        compresslevel: int | None = None) -> None:
+    """
+    Функция для записи каждого элемента в yaml файл отдельным документом
+    :param documents: Документы для записи
+    :param file_path: Путь к файлу
+    :param encoding: Кодировка файла (по умолчанию "utf-8")
+    :param compresslevel: Уровень сжатия для .gz/.bz2/.xz файлов (по умолчанию - стандартный)
+    :return: None
+    """
+    with open_file(file_path, 'w', encoding=encoding, compresslevel=compresslevel) as f:
+        yaml.dump_all(documents, f, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False)
@@ -0,0 +1,464 @@
+"""
+Замеры производительности функций из files_utils.
+
+Запуск:
+    python files_utils_bench.py suite --output results.json     # 1 КБ - 10 МБ
+    python files_utils_bench.py suite --sizes 1KB 1MB 100MB 1GB --output results.json
+    python files_utils_bench.py suite --sizes 1GB --only iter_jsonl iter_csv get_lines tail_txt
+        # read_*/write_* сами держат все записи в памяти, для 1 ГБ это несколько ГБ
+    python files_utils_bench.py compare old.json new.json        # поиск регрессий
+    python files_utils_bench.py columns
+    python files_utils_bench.py compression
+    python files_utils_bench.py yaml
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import yaml
+
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+from files_utils import (
+    read_json,
+    write_json,
+    append_json,
+    read_jsonl,
+    iter_jsonl,
+    write_jsonl,
+    append_jsonl,
+    iter_csv,
+    write_csv,
+    read_csv,
+    append_csv,
+    read_csv_columns,
+    read_txt,
+    write_txt,
+    append_txt,
+    get_lines,
+    tail_txt,
+    read_yaml,
+    iter_yaml,
+    write_yaml,
+    write_yaml_documents,
+    YAML_DUMPER,
+)
+
+
+YAML_MAX_BYTES = 100 * 2 ** 20
+
+COMPRESSION_LEVELS = {
+    '': [None],
+    '.gz': [1, 6, 9],
+    '.bz2': [1, 9],
+    '.xz': [0, 6],
+}
+
+
+def measure(func: Callable, *args, **kwargs) -> tuple[Any, float, int]:
+    """
+    Функция для замера времени выполнения и пикового потребления памяти
+    :param func: Замеряемая функция
+    :param args: Позиционные аргументы функции
+    :param kwargs: Именованные аргументы функции
+    :return: Результат функции, время в секундах и пик памяти в байтах (tracemalloc)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def parse_size(size: str) -> int:
+    """
+    Функция для перевода размера вида "10MB" в байты
+    :param size: Размер с суффиксом B, KB, MB или GB
+    :return: Размер в байтах
+    """
+    size = size.strip().upper()
+    for suffix, multiplier in (('GB', 2 ** 30), ('MB', 2 ** 20), ('KB', 2 ** 10), ('B', 1)):
+        if size.endswith(suffix):
+            return int(float(size[:-len(suffix)]) * multiplier)
+    return int(size)
+
+
+def generate_records(total_bytes: int, seed: int = 42) -> Iterator[dict[str, Any]]:
+    """
+    Генератор синтетических записей, суммарный размер которых в JSON примерно равен total_bytes.
+    При одинаковом seed записи всегда одинаковые
+    :param total_bytes: Желаемый размер данных в байтах
+    :param seed: Начальное значение генератора случайных чисел
+    :return: Записи по одной
+    """
+    rnd = random.Random(seed)
+    written = 0
+    i = 0
+    while written < total_bytes:
+        record = {
+            'id': i,
+            'name': f'user_{rnd.randrange(10 ** 6)}',
+            'price': round(rnd.random() * 1000, 2),
+            'city': rnd.choice(('Moscow', 'Novosibirsk', 'Tokyo', 'New York')),
+        }
+        written += len(json.dumps(record)) + 2
+        i += 1
+        yield record
+
+
+def consume(func: Callable) -> None:
+    """
+    Функция для вызова замеряемой функции; генераторы прочитываются до конца
+    :param func: Функция без аргументов
+    :return: None
+    """
+    result = func()
+    if isinstance(result, Iterator):
+        for _ in result:
+            pass
+
+
+def measure_case(func: Callable, setup: Callable | None = None, trace_memory: bool = True) -> dict[str, float]:
+    """
+    Функция для замера одного случая: время без tracemalloc и пик памяти отдельным прогоном
+    :param func: Замеряемая функция без аргументов
+    :param setup: Функция подготовки, вызывается перед каждым прогоном (не замеряется)
+    :param trace_memory: Замерять ли пик памяти (требует второго прогона)
+    :return: Словарь с временем в секундах и пиком памяти в байтах
+    """
+    if setup is not None:
+        setup()
+    start = time.perf_counter()
+    consume(func)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        if setup is not None:
+            setup()
+        _, _, peak = measure(consume, func)
+    return {'seconds': seconds, 'peak_bytes': peak}
+
+
+def write_fixtures(paths: dict[str, str], total_bytes: int, batch_size: int = 1000) -> int:
+    """
+    Функция для потоковой записи файлов с синтетическими записями за один проход генератора.
+    В памяти одновременно не больше batch_size записей, формат каждого файла тот же,
+    что у соответствующей write_* функции
+    :param paths: Словарь {формат: путь}, форматы - json, jsonl, csv, txt, yaml (один документ-список)
+        и yaml_documents (по документу на запись)
+    :param total_bytes: Желаемый размер данных в байтах (см. generate_records)
+    :param batch_size: Количество записей, которые выгружаются в YAML за один вызов
+    :return: Количество записей
+    """
+    files = {
+        file_format: open(path, 'w', encoding='utf-8', newline='' if file_format == 'csv' else None)
+        for file_format, path in paths.items()
+    }
+    try:
+        csv_writer = None
+        yaml_batch = []
+
+        def flush_yaml() -> None:
+            # Элементы списка YAML выгружаются порциями и вместе образуют один документ
+            if 'yaml' in files:
+                files['yaml'].write(yaml.dump(yaml_batch, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False))
+            if 'yaml_documents' in files:
+                # Каждый документ начинается с "---", поэтому порции можно записывать подряд
+                files['yaml_documents'].write(yaml.dump_all(
+                    yaml_batch, Dumper=YAML_DUMPER, allow_unicode=True, sort_keys=False, explicit_start=True))
+            yaml_batch.clear()
+
+        if 'json' in files:
+            files['json'].write('[')
+        records_count = 0
+        for records_count, record in enumerate(generate_records(total_bytes), start=1):
+            separator = records_count > 1
+            # Записи состоят из ASCII-символов, поэтому строка JSON одна для всех текстовых форматов
+            line = json.dumps(record)
+            if 'json' in files:
+                files['json'].write((', ' if separator else '') + line)
+            if 'jsonl' in files:
+                files['jsonl'].write(line + '\n')
+            if 'txt' in files:
+                files['txt'].write(('\n' if separator else '') + line)
+            if 'csv' in files:
+                if csv_writer is None:
+                    csv_writer = csv.DictWriter(files['csv'], delimiter=';', fieldnames=record.keys())
+                    csv_writer.writeheader()
+                csv_writer.writerow(record)
+            if 'yaml' in files or 'yaml_documents' in files:
+                yaml_batch.append(record)
+                if len(yaml_batch) >= batch_size:
+                    flush_yaml()
+        if yaml_batch:
+            flush_yaml()
+        if 'json' in files:
+            files['json'].write(']')
+    finally:
+        for f in files.values():
+            f.close()
+    return records_count
+
+
+def build_cases(
+        tmp_dir: str,
+        total_bytes: int,
+) -> tuple[int, dict[str, str], list[tuple[str, str, Callable, Callable | None]]]:
+    """
+    Функция для подготовки файлов и списка замеряемых случаев для одного размера данных.
+    Файлы пишутся потоково, поэтому подготовка не требует памяти под все записи;
+    write_* получают записи из генератора. YAML замеряется только для размеров
+    до YAML_MAX_BYTES: разбор YAML на порядок медленнее остальных форматов
+    :param tmp_dir: Временная директория
+    :param total_bytes: Желаемый размер данных в байтах
+    :return: Количество записей, словарь {формат: путь к файлу} и список (формат, функция, замеряемый вызов, подготовка)
+    """
+    formats = ('json', 'jsonl', 'csv', 'txt')
+    if total_bytes <= YAML_MAX_BYTES:
+        formats += ('yaml', 'yaml_documents')
+    paths = {name: os.path.join(tmp_dir, f'bench.{name}') for name in formats}
+    if 'yaml_documents' in paths:
+        paths['yaml_documents'] = os.path.join(tmp_dir, 'bench_documents.yaml')
+    records_count = write_fixtures(paths, total_bytes)
+    tail = list(islice(generate_records(total_bytes), 100))
+    tail_lines = [json.dumps(record) for record in tail]
+
+    def prepare(name: str) -> Callable:
+        return lambda: write_fixtures({name: paths[name]}, total_bytes)
+
+    def records() -> Iterator[dict[str, Any]]:
+        return generate_records(total_bytes)
+
+    cases = [
+        ('json', 'read_json', lambda: read_json(paths['json']), None),
+        ('json', 'write_json', lambda: write_json(*records(), file_path=paths['json']), None),
+        ('json', 'append_json', lambda: append_json(*tail, file_path=paths['json']), prepare('json')),
+        ('jsonl', 'read_jsonl', lambda: read_jsonl(paths['jsonl']), None),
+        ('jsonl', 'iter_jsonl', lambda: iter_jsonl(paths['jsonl']), None),
+        ('jsonl', 'write_jsonl', lambda: write_jsonl(*records(), file_path=paths['jsonl']), None),
+        ('jsonl', 'append_jsonl', lambda: append_jsonl(*tail, file_path=paths['jsonl']), prepare('jsonl')),
+        ('csv', 'read_csv', lambda: read_csv(paths['csv']), None),
+        ('csv', 'iter_csv', lambda: iter_csv(paths['csv']), None),
+        ('csv', 'read_csv_columns', lambda: read_csv_columns(paths['csv']), None),
+        ('csv', 'write_csv', lambda: write_csv(*records(), file_path=paths['csv']), None),
+        ('csv', 'append_csv', lambda: append_csv(*tail, file_path=paths['csv']), prepare('csv')),
+        ('txt', 'read_txt', lambda: read_txt(paths['txt']), None),
+        ('txt', 'write_txt', lambda: write_txt(*map(json.dumps, records()), file_path=paths['txt']), None),
+        ('txt', 'append_txt', lambda: append_txt(*tail_lines, file_path=paths['txt']), prepare('txt')),
+        ('txt', 'get_lines', lambda: get_lines(paths['txt'], records_count // 2, records_count // 2 + 100), None),
+        ('txt', 'tail_txt', lambda: tail_txt(paths['txt'], 100), None),
+        ('yaml', 'read_yaml', lambda: read_yaml(paths['yaml']), None),
+        ('yaml', 'write_yaml', lambda: write_yaml(*records(), file_path=paths['yaml']), None),
+        ('yaml_documents', 'iter_yaml', lambda: iter_yaml(paths['yaml_documents']), None),
+        ('yaml_documents', 'write_yaml_documents',
+         lambda: write_yaml_documents(*records(), file_path=paths['yaml_documents']), None),
+    ]
+    return records_count, paths, [case for case in cases if case[0] in paths]
+
+
+def run_suite(sizes: list[str], trace_memory: bool = True, only: list[str] | None = None) -> dict[str, Any]:
+    """
+    Функция для запуска всех замеров на синтетических данных указанных размеров
+    :param sizes: Размеры данных, например ["1KB", "1MB"]
+    :param trace_memory: Замерять ли пик памяти
+    :param only: Замерять только функции с указанными именами
+    :return: Результаты в виде словаря, пригодного для сохранения в JSON
+    """
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            records_count, paths, cases = build_cases(tmp_dir, parse_size(size))
+            for file_format, name, func, setup in cases:
+                if only and name not in only:
+                    continue
+                measurement = measure_case(func, setup, trace_memory)
+                file_size = os.path.getsize(paths[file_format])
+                measurement.update({
+                    'function': name,
+                    'format': file_format,
+                    'size': size,
+                    'records': records_count,
+                    'file_bytes': file_size,
+                    'mb_per_s': file_size / 2 ** 20 / measurement['seconds'] if measurement['seconds'] else None,
+                })
+                results.append(measurement)
+                peak = measurement['peak_bytes']
+                print(f'{size:>6} {name:>20}: {measurement["seconds"]:8.4f} с'
+                      + (f', пик памяти {peak / 2 ** 20:8.2f} МБ' if peak is not None else ''))
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version,
+            'platform': platform.platform(),
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+
+def compare_results(old_path: str, new_path: str, threshold: float = 0.1) -> list[str]:
+    """
+    Функция для сравнения двух файлов с результатами и поиска регрессий
+    :param old_path: Путь к старым результатам
+    :param new_path: Путь к новым результатам
+    :param threshold: Допустимое относительное ухудшение (по умолчанию 10%)
+    :return: Список описаний регрессий
+    """
+    with open(old_path, encoding='utf-8') as f:
+        old = {(r['function'], r['size']): r for r in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = {(r['function'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        for metric in ('seconds', 'peak_bytes'):
+            before, after = old[key][metric], new[key][metric]
+            if before and after and after > before * (1 + threshold):
+                regressions.append(f'{key[0]} ({key[1]}): {metric} {before:.4g} -> {after:.4g} '
+                                   f'(+{(after / before - 1) * 100:.0f}%)')
+    return regressions
+
+
+def generate_csv(file_path: str, rows_count: int) -> None:
+    """
+    Функция для генерации csv файла с числовыми и строковыми колонками
+    :param file_path: Путь к файлу
+    :param rows_count: Количество строк
+    :return: None
+    """
+    write_csv(
+        *({'id': i, 'price': i * 0.5, 'amount': i % 100, 'name': f'item_{i}'} for i in range(rows_count)),
+        file_path=file_path,
+    )
+
+
+def bench_csv_columns(rows_count: int = 200_000) -> None:
+    """
+    Сравнение read_csv (список словарей строк) и read_csv_columns (типизированные колонки)
+    на задаче суммирования числовой колонки
+    :param rows_count: Количество строк в тестовом файле
+    :return: None
+    """
+    def sum_dicts(file_path: str) -> float:
+        rows = read_csv(file_path)
+        return sum(float(row['price']) for row in rows)
+
+    def sum_columns(file_path: str) -> float:
+        columns = read_csv_columns(file_path)
+        return float(sum(columns['price']))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench.csv')
+        generate_csv(file_path, rows_count)
+        print(f'CSV: {rows_count} строк, {os.path.getsize(file_path) / 2 ** 20:.1f} МБ')
+        for name, func in (('read_csv', sum_dicts), ('read_csv_columns', sum_columns)):
+            _, elapsed, peak = measure(func, file_path)
+            print(f'{name:>20}: {elapsed:.2f} с, пик памяти {peak / 2 ** 20:.1f} МБ')
+
+
+def bench_compression(rows_count: int = 100_000) -> None:
+    """
+    Сравнение размера и скорости записи/чтения csv файла для разных алгоритмов и уровней сжатия
+    :param rows_count: Количество строк в тестовом файле
+    :return: None
+    """
+    rows = [{'id': i, 'price': i * 0.5, 'amount': i % 100, 'name': f'item_{i}'} for i in range(rows_count)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension, levels in COMPRESSION_LEVELS.items():
+            for level in levels:
+                file_path = os.path.join(tmp_dir, f'bench.csv{extension}')
+                start = time.perf_counter()
+                write_csv(*rows, file_path=file_path, compresslevel=level)
+                write_time = time.perf_counter() - start
+                start = time.perf_counter()
+                read_csv(file_path)
+                read_time = time.perf_counter() - start
+                print(f'{extension or "без сжатия":>10} {level if level is not None else "":>2}: '
+                      f'{os.path.getsize(file_path) / 2 ** 20:6.2f} МБ, '
+                      f'запись {write_time:.2f} с, чтение {read_time:.2f} с')
+                os.remove(file_path)
+
+
+def bench_yaml(documents_count: int = 5_000) -> None:
+    """
+    Сравнение чистого Python загрузчика YAML (yaml.safe_load_all) и iter_yaml (CSafeLoader, если доступен)
+    на файле из многих документов
+    :param documents_count: Количество документов в тестовом файле
+    :return: None
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench.yaml')
+        write_yaml_documents(*generate_records(documents_count * 80), file_path=file_path)
+
+        def python_loader() -> int:
+            with open(file_path, encoding='utf-8') as f:
+                return sum(1 for _ in yaml.safe_load_all(f))
+
+        def iter_yaml_loader() -> int:
+            return sum(1 for _ in iter_yaml(file_path))
+
+        print(f'YAML: {os.path.getsize(file_path) / 2 ** 20:.1f} МБ, libyaml: {yaml.__with_libyaml__}')
+        timings = {}
+        for name, func in (('safe_load_all', python_loader), ('iter_yaml', iter_yaml_loader)):
+            start = time.perf_counter()
+            func()
+            timings[name] = time.perf_counter() - start
+            print(f'{name:>15}: {timings[name]:.2f} с')
+        print(f'Ускорение: {timings["safe_load_all"] / timings["iter_yaml"]:.1f}x')
+
+
+def main() -> None:
+    """
+    Точка входа для запуска из командной строки
+    """
+    parser = argparse.ArgumentParser(description='Замеры производительности files_utils')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    suite = commands.add_parser('suite', help='Замеры всех функций')
+    suite.add_argument('--sizes', nargs='+', default=['1KB', '100KB', '1MB', '10MB'])
+    suite.add_argument('--only', nargs='+', help='Имена функций для замера')
+    suite.add_argument('--no-memory', action='store_true', help='Не замерять пик памяти')
+    suite.add_argument('--output', help='Файл для сохранения результатов в JSON')
+
+    compare = commands.add_parser('compare', help='Сравнение двух файлов с результатами')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=0.1)
+
+    commands.add_parser('columns', help='read_csv против read_csv_columns')
+    commands.add_parser('compression', help='Размер и скорость для алгоритмов сжатия')
+    commands.add_parser('yaml', help='Чистый Python загрузчик YAML против CSafeLoader')
+
+    args = parser.parse_args()
+    if args.command == 'suite':
+        results = run_suite(args.sizes, trace_memory=not args.no_memory, only=args.only)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+    elif args.command == 'compare':
+        regressions = compare_results(args.old, args.new, args.threshold)
+        print('\n'.join(regressions) or 'Регрессий не найдено')
+        sys.exit(1 if regressions else 0)
+    elif args.command == 'columns':
+        bench_csv_columns()
+    elif args.command == 'compression':
+        bench_compression()
+    else:
+        bench_yaml()
+
+
+if __name__ == '__main__':
+    main()
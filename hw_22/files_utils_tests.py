@@ -1,14 +1,40 @@
+import math
+import os
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from files_convert import convert_file, convert_tree
 from files_utils import (
     read_json,
     write_json,
     append_json,
+    read_jsonl,
+    iter_jsonl,
+    write_jsonl,
+    append_jsonl,
+    jsonl_to_json,
     read_csv,
+    iter_csv,
+    read_csv_columns,
     write_csv,
     append_csv,
     read_txt,
     write_txt,
     append_txt,
+    get_line,
+    get_lines,
+    tail_txt,
+    count_txt_lines,
     read_yaml,
+    iter_yaml,
+    write_yaml,
+    write_yaml_documents,
+    BufferedAppender,
+    enable_parse_cache,
+    disable_parse_cache,
+    get_parse_cache_stats,
 )
 
 
@@ -30,6 +56,21 @@ def test_json() -> None:
     read_data = read_json('test.json')
     print(read_data)
 
+def test_jsonl() -> None:
+    """
+    Тестирование функций для работы с JSON Lines файлами
+    :return:
+    """
+    write_jsonl(data, file_path='test.jsonl')
+    append_jsonl(new_data, file_path='test.jsonl')
+    read_data = read_jsonl('test.jsonl')
+    print(read_data)
+    assert read_data == [data, new_data]
+    assert list(iter_jsonl('test.jsonl')) == read_data
+
+    jsonl_to_json('test.jsonl', 'test.json')
+    assert read_json('test.json') == read_data
+
 def test_csv() -> None:
     """
     Тестирование функций для работы с CSV файлами
@@ -45,6 +86,41 @@ def test_csv() -> None:
     read_data = read_csv('test.csv')
     print(read_data)
 
+    assert list(iter_csv('test.csv')) == read_data
+    assert list(iter_csv('test.csv', batch_size=1)) == [[row] for row in read_data]
+    assert list(iter_csv('test.csv', batch_size=10)) == [read_data]
+
+    typed_data = read_csv('test.csv', schema='infer')
+    print(typed_data)
+    assert typed_data == [{**row, 'age': int(row['age'])} for row in read_data]
+
+    columns = read_csv_columns('test.csv', use_numpy=False)
+    print(columns)
+    assert list(columns['age']) == [int(row['age']) for row in read_data]
+    assert columns['name'] == [row['name'] for row in read_data]
+
+    with open('test_columns.csv', 'w', encoding='utf-8') as f:
+        f.write('id;price;count;day\n1;2.5;3;2024-01-01\n2;;;\n')
+    columns = read_csv_columns('test_columns.csv', use_numpy=False)
+    os.remove('test_columns.csv')
+    print(columns)
+    assert columns['price'][0] == 2.5 and math.isnan(columns['price'][1])
+    assert columns['count'].typecode == 'd' and columns['count'][0] == 3 and math.isnan(columns['count'][1])
+    assert columns['day'] == [date(2024, 1, 1), None]
+
+    # Значение, не подходящее к типу, определенному по первым 1000 строкам
+    with open('test_columns.csv', 'w', encoding='utf-8') as f:
+        f.write('id\n' + ''.join(f'{i}\n' for i in range(1500)) + 'abc\n')
+    for read in (read_csv, lambda file_path, schema: list(iter_csv(file_path, schema=schema))):
+        try:
+            read('test_columns.csv', schema='infer')
+        except ValueError as e:
+            print(e)
+            assert 'Строка 1502' in str(e) and 'id' in str(e)
+        else:
+            raise AssertionError('Ошибка преобразования должна выбрасывать ValueError')
+    os.remove('test_columns.csv')
+
 def test_txt() -> None:
     """
     Тестирование функций для работы с TXT файлами
@@ -60,14 +136,149 @@ def test_txt() -> None:
     read_data = read_txt('test.txt')
     print(read_data)
 
+    assert count_txt_lines('test.txt') == len(read_data)
+    assert get_line('test.txt', 1) == read_data[1]
+    assert get_lines('test.txt', 1, 10) == read_data[1:]
+    assert tail_txt('test.txt', 2) == read_data[-2:]
+
 def test_yaml() -> None:
     """
     Тестирование функций для работы с YAML файлами
     :return:
     """
     print(read_yaml('test.yaml'))
+    assert list(iter_yaml('test.yaml')) == [read_yaml('test.yaml')]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'test.yaml')
+        write_yaml(data, new_data, file_path=file_path)
+        assert read_yaml(file_path) == [data, new_data]
+
+        write_yaml_documents(data, new_data, file_path=file_path)
+        assert list(iter_yaml(file_path)) == [data, new_data]
+
+def test_parse_cache() -> None:
+    """
+    Тестирование кэша разобранных JSON/YAML файлов
+    :return:
+    """
+    enable_parse_cache(max_entries=1)
+    try:
+        first = read_yaml('test.yaml')
+        second = read_yaml('test.yaml')
+        assert second == first and second is not first
+        read_json('test.json')
+        stats = get_parse_cache_stats()
+        print(stats)
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 2, 1)
+
+        write_json(data, new_data, file_path='test.json')
+        cached = read_json('test.json')
+        assert cached == [data, new_data]
+        cached.clear()
+        write_json(*read_json('test.json'), file_path='test.json')
+        assert read_json('test.json') == [data, new_data]
+    finally:
+        disable_parse_cache()
+
+def test_convert() -> None:
+    """
+    Тестирование преобразования файлов между форматами
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result = convert_file('test.json', os.path.join(tmp_dir, 'test.csv'))
+        print(result)
+        assert result['error'] is None and result['records'] == 2
+
+        results = list(convert_tree(tmp_dir, os.path.join(tmp_dir, 'out'), 'jsonl', workers=2))
+        assert [result['error'] for result in results] == [None]
+        assert read_jsonl(os.path.join(tmp_dir, 'out', 'test.jsonl')) == read_csv('test.csv')
+
+        source_dir = os.path.join(tmp_dir, 'same')
+        os.makedirs(source_dir)
+        write_csv(data, file_path=os.path.join(source_dir, 'a.csv'))
+        write_json(data, file_path=os.path.join(source_dir, 'b.json'))
+        write_yaml(new_data, file_path=os.path.join(source_dir, 'b.yaml'))
+        results = {os.path.basename(result['source']): result for result in convert_tree(source_dir, source_dir, 'csv')}
+        print(results)
+        assert results['a.csv']['error'] and read_csv(os.path.join(source_dir, 'a.csv')) == [
+            {key: str(value) for key, value in data.items()}
+        ]
+        assert results['b.json']['error'] and results['b.yaml']['error']
+        assert not os.path.exists(os.path.join(source_dir, 'b.csv'))
+        assert sorted(os.listdir(source_dir)) == ['a.csv', 'b.json', 'b.yaml']
+
+def append_rows(file_path: str, worker: int, rows_count: int) -> None:
+    """
+    Добавление строк в csv файл из отдельного процесса (для test_buffered_appender)
+    :return:
+    """
+    with BufferedAppender(file_path, file_type='csv', buffer_size=256) as appender:
+        for i in range(rows_count):
+            appender.add({'worker': worker, 'row': i})
+
+def test_buffered_appender() -> None:
+    """
+    Тестирование буферизированного добавления данных из нескольких процессов
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'test.csv')
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            list(executor.map(append_rows, [file_path] * 4, range(4), [500] * 4))
+
+        rows = read_csv(file_path)
+        print(len(rows))
+        assert len(rows) == 2000
+        assert sorted((int(row['worker']), int(row['row'])) for row in rows) == [
+            (worker, i) for worker in range(4) for i in range(500)
+        ]
+
+        txt_path = os.path.join(tmp_dir, 'test.txt')
+        write_txt('first', file_path=txt_path)
+        with BufferedAppender(txt_path, fsync='never') as appender:
+            appender.add('second')
+            appender.add('third', 'fourth')
+        assert read_txt(txt_path) == ['first\n', 'second\n', 'third\n', 'fourth']
+
+        try:
+            BufferedAppender(txt_path, fsync='every_n', fsync_every=0)
+        except ValueError as e:
+            print(e)
+        else:
+            raise AssertionError('fsync_every=0 должен вызывать ValueError')
+
+def test_compression() -> None:
+    """
+    Тестирование чтения и записи сжатых файлов
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in ('.gz', '.bz2', '.xz'):
+            json_path = os.path.join(tmp_dir, 'test.json' + extension)
+            write_json(data, file_path=json_path, compresslevel=1)
+            append_json(new_data, file_path=json_path)
+            assert read_json(json_path) == [data, new_data]
+
+            csv_path = os.path.join(tmp_dir, 'test.csv' + extension)
+            write_csv(data, file_path=csv_path)
+            append_csv(new_data, file_path=csv_path)
+            assert read_csv(csv_path) == read_csv('test.csv')
+
+            txt_path = os.path.join(tmp_dir, 'test.txt' + extension)
+            write_txt('first', file_path=txt_path)
+            append_txt('second', file_path=txt_path)
+            assert read_txt(txt_path) == ['first\n', 'second']
+            print(extension, 'ok')
 
-test_json()
-test_txt()
-test_csv()
-test_yaml()
+if __name__ == '__main__':
+    test_json()
+    test_jsonl()
+    test_txt()
+    test_csv()
+    test_yaml()
+    test_parse_cache()
+    test_convert()
+    test_buffered_appender()
+    test_compression()
@@ -1,11 +1,152 @@
 import csv
 import json
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import IO, Any, Iterable, Iterator
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    import msvcrt
+    fcntl = None
 
-class TxtFileHandler:
+
+def lock_file(f: IO) -> None:
+    """
+    Установка эксклюзивной рекомендательной блокировки на открытый файл.
+
+    :param f: Открытый файл
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_file(f: IO) -> None:
+    """
+    Снятие блокировки, установленной lock_file.
+
+    :param f: Открытый файл
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def ends_with_newline(file_path: str, size: int) -> bool:
+    """
+    Проверка, заканчивается ли файл переводом строки.
+
+    :param file_path: Путь к файлу
+    :param size: Размер файла
+    :return: True, если файл пустой или его последний байт - перевод строки
+    """
+    if not size:
+        return True
+    with open(file_path, 'rb') as f:
+        f.seek(size - 1)
+        return f.read(1) in (b'\n', b'\r')
+
+
+def load_files(handler_class: type, paths: list[str]) -> list[dict[str, Any]]:
+    """
+    Чтение группы файлов одним обработчиком (выполняется в потоке или процессе пула).
+    Ошибка чтения одного файла не прерывает чтение остальных.
+
+    :param handler_class: Класс обработчика с методом load
+    :param paths: Пути к файлам
+    :return: Список словарей с путем, данными и ошибкой (если была)
+    """
+    handler = handler_class()
+    results = []
+    for path in paths:
+        result = {'path': path, 'data': None, 'error': None}
+        try:
+            result['data'] = handler.load(path)
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+        results.append(result)
+    return results
+
+
+class MultiFileReader(ABC):
+    """
+    Параллельное чтение множества файлов.
+    Для форматов, где основное время уходит на ввод-вывод, используются потоки,
+    для форматов с тяжелым разбором (CSV, JSON) - процессы.
+    """
+    executor_class: type[Executor] = ThreadPoolExecutor
+    chunk_size = 16
+
+    @abstractmethod
+    def load(self, filepath: str) -> Any:
+        """
+        Метод для чтения файла без перехвата ошибок.
+
+        :param filepath: Путь к файлу
+        :return: Содержимое файла
+        """
+        pass
+
+    def read_many(
+            self,
+            paths: Iterable[str],
+            workers: int | None = None,
+            chunk_size: int | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Генератор для параллельного чтения файлов.
+        Результаты возвращаются по мере готовности, а не в порядке paths.
+        Файлы передаются в пул группами по chunk_size, в очереди пула одновременно
+        не больше 2 * workers групп.
+
+        :param paths: Пути к файлам
+        :param workers: Количество потоков или процессов (по умолчанию - как у пула)
+        :param chunk_size: Количество файлов в одной задаче пула
+        :return: Словари {'path': путь, 'data': содержимое, 'error': ошибка или None}
+        """
+        if self.executor_class is ProcessPoolExecutor:
+            workers = workers or os.cpu_count() or 1
+        else:
+            workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        chunk_size = chunk_size or self.chunk_size
+        paths = iter(paths)
+
+        with self.executor_class(max_workers=workers) as executor:
+            pending = set()
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = [path for _, path in zip(range(chunk_size), paths)]
+                    if not chunk:
+                        break
+                    pending.add(executor.submit(load_files, type(self), chunk))
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+
+class TxtFileHandler(MultiFileReader):
     """
         Класс для работы с текстовыми файлами.
     """
+    def load(self, filepath: str) -> str:
+        """
+        Метод для чтения текстового файла без перехвата ошибок.
+
+        :param filepath: Путь к файлу.
+        :return: Содержимое файла в виде строки.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read()
+
     def read_file(self, filepath: str) -> str:
         """
         Метод для чтения текстового файла.
@@ -14,8 +155,7 @@ class TxtFileHandler:
         :return: Содержимое файла в виде строки.
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
+            return self.load(filepath)
 
         except FileNotFoundError:
             print('Файл не найден')
@@ -52,10 +192,24 @@ class TxtFileHandler:
             print(f'Ошибка при добавлении данных в файл: {e}')
 
 
-class CSVFileHandler:
+class CSVFileHandler(MultiFileReader):
     """
     Класс для работы с CSV-файлами.
     """
+    executor_class = ProcessPoolExecutor
+    chunk_size = 64
+
+    def load(self, filepath: str) -> list[dict]:
+        """
+        Метод для чтения CSV-файла без перехвата ошибок.
+
+        :param filepath: Путь к файлу.
+        :return: Список словарей с данными из файла.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            return list(reader)
+
     def read_file(self, filepath: str) -> list[dict]:
         """
         Метод для чтения CSV-файла.
@@ -64,9 +218,7 @@ class CSVFileHandler:
         :return: Список словарей с данными из файла.
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                return list(reader)
+            return self.load(filepath)
         except FileNotFoundError:
             print('Файл не найден')
             return []
@@ -96,6 +248,8 @@ class CSVFileHandler:
     def append_file(self, filepath: str, data: list[dict]) -> None:
         """
         Метод для добавления данных в CSV-файл.
+        Из файла читается только заголовок, новые строки дописываются в конец
+        под блокировкой файла, поэтому добавлять данные могут несколько процессов сразу.
 
         :param filepath: Путь к файлу.
         :param data: Данные для добавления в файл (список словарей).
@@ -105,17 +259,50 @@ class CSVFileHandler:
             return
 
         try:
-            existing_data = self.read_file(filepath)
-            combined_data = existing_data + data
-            self.write_file(filepath, combined_data)
+            with open(filepath, 'a+', encoding='utf-8', newline='') as f:
+                lock_file(f)
+                try:
+                    f.seek(0)
+                    header = f.readline()
+                    if header:
+                        fieldnames = next(csv.reader([header]))
+                        unknown_fields = {key for row in data for key in row} - set(fieldnames)
+                        if unknown_fields:
+                            print(f'Поля {sorted(unknown_fields)} отсутствуют в заголовке файла')
+                            return
+                    else:
+                        fieldnames = list(data[0].keys())
+
+                    f.seek(0, os.SEEK_END)
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    if not header:
+                        writer.writeheader()
+                    elif not ends_with_newline(filepath, os.fstat(f.fileno()).st_size):
+                        # Иначе первая новая строка склеится с последней строкой файла
+                        f.write(writer.writer.dialect.lineterminator)
+                    writer.writerows(data)
+                finally:
+                    unlock_file(f)
         except Exception as e:
             print(f'Ошибка при добавлении данных в файл: {e}')
 
 
-class JSONFileHandler:
+class JSONFileHandler(MultiFileReader):
     """
     Класс для работы с JSON-файлами.
     """
+    executor_class = ProcessPoolExecutor
+    chunk_size = 64
+
+    def load(self, filepath: str) -> list[dict]:
+        """
+        Метод для чтения JSON-файла без перехвата ошибок.
+
+        :param filepath: Путь к файлу
+        :return: Список словарей с данными из файла
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
     def read_file(self, filepath: str) -> list[dict]:
         """
@@ -125,8 +312,7 @@ class JSONFileHandler:
         :return: Список словарей с данными из файла
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.load(filepath)
         except FileNotFoundError:
             print('Файл не найден')
             return []
@@ -164,25 +350,30 @@ class JSONFileHandler:
         except Exception as e:
             print(f'Ошибка при добавлении данных в файл: {e}')
 
-# Работа с TXT файлами
-txt_handler = TxtFileHandler()
-txt_handler.write_file("example.txt", "Начало файла.\n")
-txt_handler.append_file("example.txt", "Добавляем строку.\n")
-content_txt = txt_handler.read_file("example.txt")
-print("Содержимое TXT:\n", content_txt)
-
-# Работа с CSV файлами
-csv_handler = CSVFileHandler()
-data_csv = [{'name': 'Alice', 'age': '30'}, {'name': 'Bob', 'age': '25'}]
-csv_handler.write_file("example.csv", data_csv)
-csv_handler.append_file("example.csv", [{'name': 'Charlie', 'age': '35'}])
-content_csv = csv_handler.read_file("example.csv")
-print("Содержимое CSV:\n", content_csv)
-
-# Работа с JSON файлами
-json_handler = JSONFileHandler()
-data_json = [{'product': 'Laptop', 'price': 1500}, {'product': 'Phone', 'price': 800}]
-json_handler.write_file("example.json", data_json)
-json_handler.append_file("example.json", [{'product': 'Tablet', 'price': 600}])
-content_json = json_handler.read_file("example.json")
-print("Содержимое JSON:\n", content_json)
+if __name__ == '__main__':
+    # Работа с TXT файлами
+    txt_handler = TxtFileHandler()
+    txt_handler.write_file("example.txt", "Начало файла.\n")
+    txt_handler.append_file("example.txt", "Добавляем строку.\n")
+    content_txt = txt_handler.read_file("example.txt")
+    print("Содержимое TXT:\n", content_txt)
+
+    # Работа с CSV файлами
+    csv_handler = CSVFileHandler()
+    data_csv = [{'name': 'Alice', 'age': '30'}, {'name': 'Bob', 'age': '25'}]
+    csv_handler.write_file("example.csv", data_csv)
+    csv_handler.append_file("example.csv", [{'name': 'Charlie', 'age': '35'}])
+    content_csv = csv_handler.read_file("example.csv")
+    print("Содержимое CSV:\n", content_csv)
+
+    # Работа с JSON файлами
+    json_handler = JSONFileHandler()
+    data_json = [{'product': 'Laptop', 'price': 1500}, {'product': 'Phone', 'price': 800}]
+    json_handler.write_file("example.json", data_json)
+    json_handler.append_file("example.json", [{'product': 'Tablet', 'price': 600}])
+    content_json = json_handler.read_file("example.json")
+    print("Содержимое JSON:\n", content_json)
+
+    # Параллельное чтение нескольких файлов
+    for result in json_handler.read_many(["example.json", "missing.json"], workers=2):
+        print(result['path'], result['error'] or result['data'])
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+
+from hw_25 import CSVFileHandler, JSONFileHandler, TxtFileHandler
+
+
+def make_corpus(directory: str, files_count: int, rows: int = 50) -> dict[str, list[str]]:
+    """
+    Создание набора небольших TXT, CSV и JSON файлов
+
+    :param directory: Директория для файлов
+    :param files_count: Количество файлов каждого формата
+    :param rows: Количество строк (записей) в каждом файле
+    :return: Словарь {расширение: список путей}
+    """
+    data = [{'id': str(i), 'product': f'product_{i}', 'price': str(i * 1.5)} for i in range(rows)]
+    paths = {'txt': [], 'csv': [], 'json': []}
+    for i in range(files_count):
+        for extension, handler in (('txt', None), ('csv', CSVFileHandler()), ('json', JSONFileHandler())):
+            path = os.path.join(directory, f'{i}.{extension}')
+            if handler is None:
+                TxtFileHandler().write_file(path, *(f'{row}\n' for row in data))
+            else:
+                handler.write_file(path, data)
+            paths[extension].append(path)
+    return paths
+
+
+def bench_read_many(files_count: int = 10_000, workers: tuple[int, ...] = (1, 2, 4, 8)) -> None:
+    """
+    Сравнение последовательного чтения файлов через read_file и read_many
+    с разным количеством потоков (процессов)
+
+    :param files_count: Количество файлов каждого формата
+    :param workers: Варианты количества потоков (процессов)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = make_corpus(tmp_dir, files_count)
+        print(f'{files_count} файлов каждого формата, ядер: {os.cpu_count()}')
+        for extension, handler in (('txt', TxtFileHandler()), ('csv', CSVFileHandler()), ('json', JSONFileHandler())):
+            start = time.perf_counter()
+            for path in paths[extension]:
+                handler.read_file(path)
+            serial = time.perf_counter() - start
+            print(f'{extension:>4} {"serial":>10}: {serial:.2f} с')
+
+            for count in workers:
+                start = time.perf_counter()
+                errors = sum(1 for result in handler.read_many(paths[extension], workers=count) if result['error'])
+                elapsed = time.perf_counter() - start
+                print(f'{extension:>4} {f"workers={count}":>10}: {elapsed:.2f} с (x{serial / elapsed:.1f}), ошибок: {errors}')
+
+
+if __name__ == '__main__':
+    bench_read_many(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -1,28 +1,317 @@
+import hashlib
+import io
+import json
+import math
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Any, Iterator
+
 from PIL import Image
 from pillow_heif import register_heif_opener
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MANIFEST_NAME = '.heic_manifest.jsonl'
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Вычисляет хеш содержимого файла, читая его частями.
+
+    Args:
+        file_path (str): Путь к файлу.
+        chunk_size (int): Размер читаемой части в байтах.
+
+    Returns:
+        str: Хеш BLAKE2b в шестнадцатеричном виде.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def psnr(reference: 'np.ndarray', image: 'np.ndarray') -> float:
+    """
+    Пиковое отношение сигнал/шум между двумя изображениями.
+
+    Args:
+        reference (np.ndarray): Исходное изображение (яркость, 0-255).
+        image (np.ndarray): Сжатое изображение того же размера.
+
+    Returns:
+        float: PSNR в децибелах (inf для одинаковых изображений).
+    """
+    mse = float(np.mean((reference - image) ** 2))
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def ssim(reference: 'np.ndarray', image: 'np.ndarray', block: int = 8) -> float:
+    """
+    Индекс структурного сходства (SSIM), усреднённый по непересекающимся блокам block x block.
+    Для изображений меньше блока размер блока уменьшается до меньшей стороны изображения.
+
+    Args:
+        reference (np.ndarray): Исходное изображение (яркость, 0-255).
+        image (np.ndarray): Сжатое изображение того же размера.
+        block (int): Размер блока в пикселях.
+
+    Returns:
+        float: SSIM от -1 до 1 (1 - изображения совпадают).
+    """
+    # Иначе не остаётся ни одного блока и среднее по пустому массиву даёт NaN
+    block = max(1, min(block, reference.shape[0], reference.shape[1]))
+    height = reference.shape[0] // block * block
+    width = reference.shape[1] // block * block
+    shape = (height // block, block, width // block, block)
+    a = reference[:height, :width].reshape(shape)
+    b = image[:height, :width].reshape(shape)
+    mean_a = a.mean(axis=(1, 3), keepdims=True)
+    mean_b = b.mean(axis=(1, 3), keepdims=True)
+    var_a = ((a - mean_a) ** 2).mean(axis=(1, 3))
+    var_b = ((b - mean_b) ** 2).mean(axis=(1, 3))
+    covariance = ((a - mean_a) * (b - mean_b)).mean(axis=(1, 3))
+    mean_a, mean_b = mean_a[:, 0, :, 0], mean_b[:, 0, :, 0]
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    index = ((2 * mean_a * mean_b + c1) * (2 * covariance + c2)
+             / ((mean_a ** 2 + mean_b ** 2 + c1) * (var_a + var_b + c2)))
+    return float(index.mean())
+
+
+def resize_variants(
+        img: Image.Image,
+        widths: tuple[int, ...],
+        keep_original: bool = True,
+) -> dict[int | None, Image.Image]:
+    """
+    Создаёт уменьшенные копии изображения заданной ширины за одно декодирование.
+    Если исходный размер не нужен, JPEG декодируется сразу в уменьшенном виде
+    (draft - уменьшение в 2, 4 или 8 раз при декодировании DCT). Каждая копия
+    получается из предыдущей, большей: сначала reduce в целое число раз, затем LANCZOS.
+    Изображения не увеличиваются.
+
+    Args:
+        img (Image.Image): Открытое, но ещё не загруженное изображение.
+        widths (tuple[int, ...]): Ширины уменьшенных копий.
+        keep_original (bool): Вернуть также изображение исходного размера.
+
+    Returns:
+        dict: Словарь {ширина: изображение}, ключ None - исходный размер.
+    """
+    widths = sorted({width for width in widths if width < img.width}, reverse=True)
+    if not keep_original and widths and img.format == "JPEG":
+        img.draft(img.mode, (widths[0], math.ceil(img.height * widths[0] / img.width)))
+    img.load()
+
+    variants = {None: img} if keep_original else {}
+    source = img
+    for width in widths:
+        height = max(1, round(img.height * width / img.width))
+        source = source.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        variants[width] = source
+    return variants
+
+
+class CompressionManifest:
+    """
+    Манифест сжатых изображений в формате JSON Lines: для каждого исходного файла
+    хранятся размер, время изменения, хеш содержимого, качество, формат и путь результата.
+    Новые записи дописываются в конец файла сразу после сжатия, при закрытии
+    устаревшие дубликаты удаляются.
+    """
+
+    def __init__(self, manifest_path: str, root: str):
+        """
+        Конструктор класса. Загружает существующий манифест, если он есть.
+
+        Args:
+            manifest_path (str): Путь к файлу манифеста.
+            root (str): Директория, относительно которой хранятся пути к файлам.
+        """
+        self.manifest_path = manifest_path
+        self.root = root
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lines = 0
+        self._file = None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописанная строка после аварийного завершения
+                        continue
+                    self.entries[entry['input']] = entry
+                    self._lines += 1
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'CompressionManifest':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def key(self, path: str) -> str:
+        """
+        Путь к файлу относительно корневой директории манифеста.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            str: Относительный путь.
+        """
+        return os.path.relpath(path, self.root)
+
+    def is_up_to_date(self, input_path: str, output_path: str, quality: int | dict, format: str) -> bool:
+        """
+        Проверяет, что сжатое изображение уже есть и соответствует исходному файлу и параметрам.
+        Хеш вычисляется только если размер совпал, а время изменения - нет (например, после копирования).
+
+        Args:
+            input_path (str): Путь к исходному изображению.
+            output_path (str): Путь к сжатому изображению.
+            quality (int | dict): Качество сжатия или параметры его подбора.
+            format (str): Формат сжатого изображения.
+
+        Returns:
+            bool: True, если изображение можно не сжимать повторно.
+        """
+        entry = self.entries.get(self.key(input_path))
+        if (entry is None or entry['quality'] != quality or entry['format'] != format
+                or entry['output'] != self.key(output_path)):
+            return False
+        try:
+            stat = os.stat(input_path)
+            if not os.path.exists(output_path):
+                return False
+        except OSError:
+            return False
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+        if file_hash(input_path) != entry['hash']:
+            return False
+        self.add(input_path, output_path, stat.st_size, stat.st_mtime_ns, entry['hash'], quality, format)
+        return True
+
+    def add(
+            self,
+            input_path: str,
+            output_path: str,
+            size: int,
+            mtime_ns: int,
+            digest: str,
+            quality: int | dict,
+            format: str,
+    ) -> None:
+        """
+        Добавляет (или обновляет) запись о сжатом изображении.
+
+        Args:
+            input_path (str): Путь к исходному изображению.
+            output_path (str): Путь к сжатому изображению.
+            size (int): Размер исходного файла в байтах.
+            mtime_ns (int): Время изменения исходного файла в наносекундах.
+            digest (str): Хеш содержимого исходного файла.
+            quality (int | dict): Качество сжатия или параметры его подбора.
+            format (str): Формат сжатого изображения.
+        """
+        entry = {'input': self.key(input_path), 'size': size, 'mtime_ns': mtime_ns, 'hash': digest,
+                 'quality': quality, 'format': format, 'output': self.key(output_path)}
+        self.entries[entry['input']] = entry
+        if self._file is None:
+            self._file = open(self.manifest_path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._lines += 1
+
+    def close(self) -> None:
+        """
+        Закрывает файл манифеста и перезаписывает его без устаревших записей,
+        если они появились.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lines > len(self.entries):
+            tmp_path = f'{self.manifest_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.manifest_path)
+            self._lines = len(self.entries)
+
 
 class ImageCompressor:
 
     supported_formats = ('.jpg', '.jpeg', '.png')
 
-    def __init__(self, quality: int = 50):
+    def __init__(
+            self,
+            quality: int = 50,
+            target_size: int | None = None,
+            min_ssim: float | None = None,
+            min_psnr: float | None = None,
+            max_iterations: int = 7,
+            widths: tuple[int, ...] = (),
+            include_original: bool = True,
+    ):
         """
         Конструктор класса.
+        Если задан target_size, min_ssim или min_psnr, качество подбирается для каждого
+        изображения двоичным поиском в диапазоне от 1 до quality:
+        для target_size - наибольшее качество, при котором файл не больше target_size байт,
+        для min_ssim/min_psnr - наименьшее качество, при котором достигаются оба порога.
 
         Args:
-            quality (int): Качество сжатия изображения (от 1 до 100).
+            quality (int): Качество сжатия изображения (от 1 до 100), при подборе - верхняя граница.
+            target_size (int | None): Максимальный размер сжатого изображения в байтах.
+            min_ssim (float | None): Минимальный SSIM сжатого изображения относительно исходного.
+            min_psnr (float | None): Минимальный PSNR (дБ) сжатого изображения относительно исходного.
+            max_iterations (int): Максимальное количество пробных сжатий при подборе качества.
+            widths (tuple[int, ...]): Ширины уменьшенных копий, которые сохраняются рядом
+                с изображением исходного размера (photo_640.heic), например (320, 640, 1280).
+            include_original (bool): Сохранять ли изображение исходного размера. Без него JPEG
+                декодируется сразу в уменьшенном виде; изображение уже всех widths сохраняется как есть.
 
         Raises:
-            ValueError: Если значение выходит за пределы допустимого диапазона (1-100).
+            ValueError: Если значение выходит за пределы допустимого диапазона (1-100),
+                заданы одновременно target_size и порог качества, max_iterations меньше 1
+                или include_original=False без widths.
             TypeError: Если значение не целочисленное.
+            ImportError: Если для min_ssim/min_psnr не установлен NumPy.
         """
         if not isinstance(quality, int):
             raise TypeError("Качество сжатия должно быть целым числом.")
         if not 1 <= quality <= 100:
             raise ValueError("Качество сжатия должно быть в диапазоне от 1 до 100.")
+        if target_size is not None and (min_ssim is not None or min_psnr is not None):
+            raise ValueError("Нельзя одновременно задавать target_size и min_ssim/min_psnr.")
+        if target_size is not None and target_size < 1:
+            raise ValueError("Размер target_size должен быть положительным.")
+        if max_iterations < 1:
+            raise ValueError("Количество итераций max_iterations должно быть не меньше 1.")
+        if not all(isinstance(width, int) and width > 0 for width in widths):
+            raise ValueError("Ширины widths должны быть положительными целыми числами.")
+        if not include_original and not widths:
+            raise ValueError("Без изображения исходного размера нужно указать ширины widths.")
+        if (min_ssim is not None or min_psnr is not None) and np is None:
+            raise ImportError("Для min_ssim/min_psnr требуется NumPy.")
         self.__quality = quality
+        self.target_size = target_size
+        self.min_ssim = min_ssim
+        self.min_psnr = min_psnr
+        self.max_iterations = max_iterations
+        self.widths = tuple(widths)
+        self.include_original = include_original
 
     @property
     def quality(self) -> int:
@@ -52,6 +341,161 @@ class ImageCompressor:
             raise ValueError("Качество сжатия должно быть в диапазоне от 1 до 100.")
         self.__quality = quality
 
+    @property
+    def auto_quality(self) -> bool:
+        """
+        Подбирается ли качество для каждого изображения.
+
+        Returns:
+            bool: True, если задан target_size, min_ssim или min_psnr.
+        """
+        return self.target_size is not None or self.min_ssim is not None or self.min_psnr is not None
+
+    @property
+    def settings(self) -> int | dict[str, Any]:
+        """
+        Параметры сжатия для манифеста: качество или условия его подбора.
+
+        Returns:
+            int | dict: Качество сжатия или словарь с параметрами подбора.
+        """
+        if not self.auto_quality and not self.widths:
+            return self.__quality
+        settings = {'quality': self.__quality, 'target_size': self.target_size, 'min_ssim': self.min_ssim,
+                    'min_psnr': self.min_psnr, 'max_iterations': self.max_iterations, 'widths': list(self.widths)}
+        if not self.include_original:
+            settings['include_original'] = False
+        return settings
+
+    def encode(self, img: Image.Image, quality: int) -> bytes:
+        """
+        Сжимает изображение в HEIF в памяти.
+
+        Args:
+            img (Image.Image): Изображение.
+            quality (int): Качество сжатия.
+
+        Returns:
+            bytes: Сжатое изображение.
+        """
+        buffer = io.BytesIO()
+        img.save(buffer, "HEIF", quality=quality)
+        return buffer.getvalue()
+
+    def tune_quality(self, img: Image.Image) -> tuple[int, bytes]:
+        """
+        Подбирает качество сжатия двоичным поиском (не больше max_iterations пробных сжатий).
+        Результаты пробных сжатий кешируются и повторно не вычисляются.
+        Если ни одно пробное сжатие не подошло, для target_size возвращается самое
+        маленькое из них, для min_ssim/min_psnr - самое качественное.
+
+        Args:
+            img (Image.Image): Изображение.
+
+        Returns:
+            tuple[int, bytes]: Подобранное качество и сжатое изображение.
+        """
+        encoded: dict[int, bytes] = {}
+        reference = None
+        if self.target_size is None:
+            reference = np.asarray(img.convert('L'), dtype=np.float32)
+
+        def acceptable(quality: int) -> bool:
+            encoded[quality] = self.encode(img, quality)
+            if self.target_size is not None:
+                return len(encoded[quality]) <= self.target_size
+            with Image.open(io.BytesIO(encoded[quality])) as compressed:
+                image = np.asarray(compressed.convert('L'), dtype=np.float32)
+            if self.min_psnr is not None and psnr(reference, image) < self.min_psnr:
+                return False
+            return self.min_ssim is None or ssim(reference, image) >= self.min_ssim
+
+        low, high, best = 1, self.__quality, None
+        for _ in range(self.max_iterations):
+            if low > high:
+                break
+            middle = (low + high + 1) // 2
+            if acceptable(middle):
+                best = middle
+                # Для размера ищем качество выше, для порога качества - ниже
+                if self.target_size is not None:
+                    low = middle + 1
+                else:
+                    high = middle - 1
+            elif self.target_size is not None:
+                high = middle - 1
+            else:
+                low = middle + 1
+
+        if best is None:
+            if self.target_size is not None:
+                best = min(encoded, key=lambda quality: len(encoded[quality]))
+            else:
+                best = max(encoded)
+        return best, encoded[best]
+
+    def save(self, img: Image.Image, output_path: str) -> int:
+        """
+        Сохраняет изображение в формате HEIF с заданным или подобранным качеством.
+
+        Args:
+            img (Image.Image): Изображение.
+            output_path (str): Путь для сохранения сжатого изображения.
+
+        Returns:
+            int: Использованное качество сжатия.
+        """
+        if not self.auto_quality:
+            img.save(output_path, "HEIF", quality=self.__quality)
+            return self.__quality
+        quality, data = self.tune_quality(img)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return quality
+
+    def main_output_path(self, output_path: str) -> str:
+        """
+        Путь к основному сжатому файлу: изображению исходного размера или, если оно
+        не сохраняется, самой большой из уже сохранённых уменьшенных копий.
+
+        Args:
+            output_path (str): Путь для сохранения изображения исходного размера.
+
+        Returns:
+            str: Путь к основному файлу (output_path, если копий ещё нет).
+        """
+        if not self.include_original:
+            base_path, extension = os.path.splitext(output_path)
+            for width in sorted(self.widths, reverse=True):
+                path = f'{base_path}_{width}{extension}'
+                if os.path.exists(path):
+                    return path
+        return output_path
+
+    def save_variants(self, img: Image.Image, output_path: str) -> tuple[int, int, str]:
+        """
+        Сохраняет изображение исходного размера (если include_original) и уменьшенные копии
+        шириной widths (ширина добавляется к имени файла: photo_640.heic).
+
+        Args:
+            img (Image.Image): Открытое изображение.
+            output_path (str): Путь для сохранения изображения исходного размера.
+
+        Returns:
+            tuple[int, int, str]: Качество сжатия основного изображения (исходного размера или самой
+                большой копии), общий размер файлов в байтах и путь к основному изображению.
+        """
+        base_path, extension = os.path.splitext(output_path)
+        quality, total_bytes, main_path = self.__quality, 0, None
+        variants = resize_variants(img, self.widths, keep_original=self.include_original) or {None: img}
+        for width, variant in variants.items():
+            path = output_path if width is None else f'{base_path}_{width}{extension}'
+            variant_quality = self.save(variant, path)
+            if main_path is None:
+                quality, main_path = variant_quality, path
+            total_bytes += os.path.getsize(path)
+        return quality, total_bytes, main_path
+
     def compress_image(self, input_path: str, output_path: str) -> None:
         """
         Сжимает изображение и сохраняет его в формате HEIF.
@@ -64,26 +508,165 @@ class ImageCompressor:
             None
         """
         with Image.open(input_path) as img:
-            img.save(output_path, "HEIF", quality=self.__quality)
+            self.save_variants(img, output_path)
         print(f"Сжато: {input_path} -> {output_path}")
 
-    def process_directory(self, directory: str) -> None:
+    def compress_file(self, input_path: str, output_path: str, with_hash: bool = False) -> dict[str, Any]:
         """
-        Обрабатывает все изображения в указанной директории и её поддиректориях.
+        Сжимает одно изображение и замеряет время. Ошибка не прерывает обработку
+        остальных файлов, а возвращается в результате.
 
         Args:
-            directory (str): Путь к директории для обработки.
+            input_path (str): Путь к исходному изображению.
+            output_path (str): Путь для сохранения сжатого изображения.
+            with_hash (bool): Вычислить хеш исходного файла (для манифеста).
 
         Returns:
-            None
+            dict: Пути, размеры до и после сжатия (вместе с уменьшенными копиями), время изменения
+                и хеш исходного файла, использованное качество, время в секундах и ошибка (если была).
+        """
+        result = {'input': input_path, 'output': output_path, 'input_bytes': 0, 'output_bytes': 0,
+                  'mtime_ns': 0, 'hash': None, 'quality': self.__quality, 'seconds': 0.0,
+                  'skipped': False, 'error': None}
+        start = time.perf_counter()
+        try:
+            stat = os.stat(input_path)
+            result['input_bytes'] = stat.st_size
+            result['mtime_ns'] = stat.st_mtime_ns
+            if with_hash:
+                result['hash'] = file_hash(input_path)
+            with Image.open(input_path) as img:
+                result['quality'], result['output_bytes'], result['output'] = self.save_variants(img, output_path)
+        except Exception as e:
+            result['error'] = f'{type(e).__name__}: {e}'
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    def find_images(self, directory: str) -> Iterator[str]:
+        """
+        Генератор путей ко всем поддерживаемым изображениям в директории и её поддиректориях.
+
+        Args:
+            directory (str): Путь к директории.
+
+        Returns:
+            Iterator[str]: Пути к изображениям.
         """
         for root, _, files in os.walk(directory):
             for file in files:
                 # Проверяем расширение файла
                 if file.lower().endswith(self.supported_formats):
-                    input_path = os.path.join(root, file)
-                    output_path = os.path.splitext(input_path)[0] + '.heic'
-                    self.compress_image(input_path, output_path)
+                    yield os.path.join(root, file)
+
+    def iter_compress(
+            self,
+            directory: str,
+            workers: int | None = 1,
+            manifest: CompressionManifest | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Генератор для сжатия всех изображений директории в workers процессах.
+        Файлы передаются в пул по мере обхода директории, в очереди пула одновременно
+        не больше 2 * workers задач, поэтому память не растёт с количеством файлов.
+        Если передан манифест, файлы без изменений пропускаются, а сжатые - добавляются в него.
+
+        Args:
+            directory (str): Путь к директории для обработки.
+            workers (int | None): Количество процессов (1 - без пула, None - количество ядер).
+            manifest (CompressionManifest | None): Манифест ранее сжатых изображений.
+
+        Returns:
+            Iterator[dict]: Результаты compress_file по мере готовности.
+        """
+        workers = workers or os.cpu_count() or 1
+        with_hash = manifest is not None
+
+        def outputs() -> Iterator[tuple[str, str, bool]]:
+            # Пропущенные файлы отдаются сразу при обходе, без накопления в памяти
+            for input_path in self.find_images(directory):
+                output_path = os.path.splitext(input_path)[0] + '.heic'
+                main_path = self.main_output_path(output_path)
+                skipped = manifest is not None and manifest.is_up_to_date(
+                    input_path, main_path, self.settings, 'heic')
+                yield input_path, main_path if skipped else output_path, skipped
+
+        def record(result: dict[str, Any]) -> dict[str, Any]:
+            if manifest is not None and not result['error']:
+                manifest.add(result['input'], result['output'], result['input_bytes'], result['mtime_ns'],
+                             result['hash'], self.settings, 'heic')
+            return result
+
+        if workers == 1:
+            for input_path, output_path, skipped in outputs():
+                if skipped:
+                    yield {'input': input_path, 'output': output_path, 'skipped': True, 'error': None}
+                else:
+                    yield record(self.compress_file(input_path, output_path, with_hash))
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=register_heif_opener) as executor:
+            pending = set()
+            for input_path, output_path, skipped in outputs():
+                if skipped:
+                    yield {'input': input_path, 'output': output_path, 'skipped': True, 'error': None}
+                    continue
+                pending.add(executor.submit(self.compress_file, input_path, output_path, with_hash))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield record(future.result())
+            for future in as_completed(pending):
+                yield record(future.result())
+
+    def process_directory(
+            self,
+            directory: str,
+            workers: int | None = 1,
+            incremental: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Обрабатывает все изображения в указанной директории и её поддиректориях,
+        выводит время сжатия каждого файла и итоговую сводку.
+        В инкрементальном режиме сжатые изображения записываются в манифест
+        (файл MANIFEST_NAME в корне директории), и при повторном запуске
+        обрабатываются только новые и изменённые файлы.
+
+        Args:
+            directory (str): Путь к директории для обработки.
+            workers (int | None): Количество процессов (1 - без пула, None - количество ядер).
+            incremental (bool): Пропускать изображения, которые уже сжаты с теми же параметрами.
+
+        Returns:
+            dict: Сводка - количество файлов, пропущенных файлов и ошибок, размеры до и после сжатия, общее время.
+        """
+        summary = {'files': 0, 'skipped': 0, 'errors': 0, 'input_bytes': 0, 'output_bytes': 0, 'seconds': 0.0}
+        start = time.perf_counter()
+        manifest = CompressionManifest(os.path.join(directory, MANIFEST_NAME), directory) if incremental else None
+        try:
+            for result in self.iter_compress(directory, workers, manifest):
+                summary['files'] += 1
+                if result['skipped']:
+                    summary['skipped'] += 1
+                    continue
+                if result['error']:
+                    summary['errors'] += 1
+                    print(f"Ошибка: {result['input']} - {result['error']}")
+                    continue
+                summary['input_bytes'] += result['input_bytes']
+                summary['output_bytes'] += result['output_bytes']
+                print(f"Сжато: {result['input']} -> {result['output']} "
+                      f"(качество {result['quality']}) за {result['seconds']:.2f} с")
+        finally:
+            if manifest is not None:
+                manifest.close()
+        summary['seconds'] = time.perf_counter() - start
+
+        speed = summary['files'] / summary['seconds'] if summary['seconds'] else 0
+        print(f"Обработано файлов: {summary['files']}, пропущено без изменений: {summary['skipped']}, "
+              f"ошибок: {summary['errors']}, "
+              f"{summary['input_bytes'] / 2 ** 20:.1f} МБ -> {summary['output_bytes'] / 2 ** 20:.1f} МБ "
+              f"за {summary['seconds']:.1f} с ({speed:.1f} файлов/с)")
+        return summary
 
 
 def main() -> None:
@@ -111,7 +694,7 @@ def main() -> None:
     elif os.path.isdir(user_input):
         # Если указан путь к директории, обрабатываем все файлы в ней
         print(f"Обрабатываем директорию: {user_input}")
-        compressor.process_directory(user_input)
+        compressor.process_directory(user_input, workers=None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from file_classes import AbstractFile, CSVFileHandler, JSONFileHandler, TxtFileHandler
+
+DEFAULT_MAX_WORKERS = 32
+
+_default_executor: ThreadPoolExecutor | None = None
+
+
+def get_default_executor() -> ThreadPoolExecutor:
+    """
+    Общий пул потоков для асинхронных обработчиков (создается при первом обращении)
+
+    :return: Пул потоков с DEFAULT_MAX_WORKERS потоками
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='async-file')
+    return _default_executor
+
+
+class AsyncAbstractFile(ABC):
+    """
+    Асинхронный интерфейс к FileHandlers.
+    Блокирующий ввод-вывод и разбор файла выполняются синхронным обработчиком
+    в пуле (по умолчанию - общий ограниченный пул потоков), event loop не блокируется.
+    Для тяжелого разбора можно передать ProcessPoolExecutor.
+    """
+    file_path: str
+
+    def __init__(self, file_path: str, executor: Executor | None = None):
+        self.file_path = file_path
+        self.executor = executor
+        self.handler = self.create_handler()
+
+    @abstractmethod
+    def create_handler(self) -> AbstractFile:
+        """
+        Метод для создания синхронного обработчика файла
+
+        :return: Обработчик файла
+        """
+        pass
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Метод для выполнения блокирующей функции в пуле
+
+        :param func: Функция
+        :param args: Аргументы функции
+        :return: Результат функции
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor or get_default_executor(), partial(func, *args))
+
+    async def read(self) -> Any:
+        """
+        Метод для чтения
+
+        :return: Содержимое файла
+        """
+        return await self.run(self.handler.read)
+
+    async def write(self, *data: Any) -> None:
+        """
+        Метод для записи данных в файл
+
+        :param data: данные для записи
+        """
+        await self.run(self.handler.write, *data)
+
+    async def append(self, *data: Any) -> None:
+        """
+        Метод для добавления данных в файл
+
+        :param data: данные для добавления
+        """
+        await self.run(self.handler.append, *data)
+
+
+class AsyncTxtFileHandler(AsyncAbstractFile):
+    """
+    Асинхронный класс для работы с текстовыми файлами.
+    """
+
+    def create_handler(self) -> TxtFileHandler:
+        return TxtFileHandler(self.file_path)
+
+
+class AsyncCSVFileHandler(AsyncAbstractFile):
+    """
+    Асинхронный класс для работы с CSV-файлами.
+    """
+
+    def create_handler(self) -> CSVFileHandler:
+        return CSVFileHandler(self.file_path)
+
+
+class AsyncJSONFileHandler(AsyncAbstractFile):
+    """
+    Асинхронный класс для работы с JSON-файлами.
+    """
+
+    def create_handler(self) -> JSONFileHandler:
+        return JSONFileHandler(self.file_path)
+
+
+ASYNC_HANDLERS = {
+    '.txt': AsyncTxtFileHandler,
+    '.csv': AsyncCSVFileHandler,
+    '.json': AsyncJSONFileHandler,
+}
+
+
+async def gather_read(paths: list[str], executor: Executor | None = None) -> list[Any]:
+    """
+    Параллельное чтение нескольких файлов. Обработчик выбирается по расширению файла.
+
+    :param paths: Пути к файлам
+    :param executor: Пул для выполнения чтения (по умолчанию - общий пул потоков)
+    :return: Содержимое файлов в том же порядке, что и paths
+    """
+    handlers = []
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in ASYNC_HANDLERS:
+            raise ValueError(f'Формат файла {path} не поддерживается')
+        handlers.append(ASYNC_HANDLERS[extension](path, executor))
+    return await asyncio.gather(*(handler.read() for handler in handlers))
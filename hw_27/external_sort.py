@@ -0,0 +1,239 @@
+import csv
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator
+
+KeyType = str | list[str] | Callable[[dict], object] | None
+
+MERGE_FAN_IN = 64
+
+
+def make_key(key: KeyType, fieldnames: list[str]) -> Callable[[dict], object]:
+    """
+    Построение функции ключа сортировки
+
+    :param key: Имя колонки, список колонок, функция от строки или None (все колонки)
+    :param fieldnames: Колонки файла
+    :return: Функция ключа (pickle-совместимая, если key - колонки)
+    """
+    if callable(key):
+        return key
+    columns = fieldnames if key is None else [key] if isinstance(key, str) else key
+    missing_columns = [column for column in columns if column not in fieldnames]
+    if missing_columns:
+        raise ValueError(f'Колонки {missing_columns} отсутствуют в файле')
+    return itemgetter(*columns)
+
+
+def row_size(row: dict) -> int:
+    """
+    Приблизительный размер строки в памяти
+
+    :param row: Строка CSV в виде словаря
+    :return: Размер в байтах
+    """
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+
+
+def read_rows(file_path: str) -> Iterator[dict]:
+    """
+    Чтение строк CSV-файла без перехвата ошибок
+
+    :param file_path: Путь к файлу
+    :return: Строки в виде словарей
+    :raises ValueError: Если количество значений в строке не совпадает с заголовком
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if None in row or None in row.values():
+                raise ValueError(f'Строка {reader.line_num}: количество значений не совпадает с заголовком')
+            yield row
+
+
+def write_rows(rows: Iterable[dict], output_path: str, fieldnames: list[str]) -> str:
+    """
+    Потоковая запись строк в CSV-файл. Ошибки записи не перехватываются,
+    чтобы не получить неполный файл.
+
+    :param rows: Строки
+    :param output_path: Путь к файлу
+    :param fieldnames: Колонки файла
+    :return: Путь к файлу
+    """
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_path
+
+
+def sort_run(rows: list[dict], key: Callable[[dict], object], run_path: str, fieldnames: list[str]) -> str:
+    """
+    Сортировка одной порции строк и запись ее во временный файл (выполняется в пуле процессов)
+
+    :param rows: Строки
+    :param key: Функция ключа
+    :param run_path: Путь к временному файлу
+    :param fieldnames: Колонки файла
+    :return: Путь к временному файлу
+    """
+    rows.sort(key=key)
+    return write_rows(rows, run_path, fieldnames)
+
+
+def merge_runs(runs: list[str], key: Callable[[dict], object]) -> Iterator[dict]:
+    """
+    Слияние отсортированных временных файлов.
+    heapq.merge устойчив: при равных ключах первыми идут строки из более ранних файлов.
+
+    :param runs: Пути к временным файлам в порядке исходного файла
+    :param key: Функция ключа
+    :return: Отсортированные строки
+    """
+    return heapq.merge(*(read_rows(run) for run in runs), key=key)
+
+
+def sorted_rows(
+        file_path: str,
+        fieldnames: list[str],
+        key: Callable[[dict], object],
+        tmp_dir: str,
+        memory_limit: int,
+        workers: int,
+) -> Iterator[dict]:
+    """
+    Внешняя сортировка: файл читается порциями, каждая порция сортируется в пуле процессов
+    и сбрасывается во временный файл, затем временные файлы сливаются heapq.merge.
+    Одновременно открыто не больше MERGE_FAN_IN временных файлов: если их больше,
+    они сливаются в несколько проходов.
+
+    :param file_path: Путь к исходному файлу
+    :param fieldnames: Колонки файла
+    :param key: Функция ключа
+    :param tmp_dir: Директория для временных файлов
+    :param memory_limit: Ограничение памяти на порции в байтах
+    :param workers: Количество процессов
+    :return: Отсортированные строки
+    """
+    # В памяти одновременно находятся: читаемая порция и до workers сортируемых
+    chunk_limit = max(memory_limit // (workers + 1), 1)
+    runs = []
+    run_count = 0
+
+    def next_run_path() -> str:
+        nonlocal run_count
+        run_count += 1
+        return os.path.join(tmp_dir, f'run_{run_count}.csv')
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        chunk, chunk_size = [], 0
+        for row in read_rows(file_path):
+            chunk.append(row)
+            chunk_size += row_size(row)
+            if chunk_size >= chunk_limit:
+                if len(pending) >= workers:
+                    runs.append(pending.pop(0).result())
+                pending.append(executor.submit(sort_run, chunk, key, next_run_path(), fieldnames))
+                chunk, chunk_size = [], 0
+        if chunk:
+            pending.append(executor.submit(sort_run, chunk, key, next_run_path(), fieldnames))
+        runs.extend(future.result() for future in pending)
+
+    while len(runs) > MERGE_FAN_IN:
+        merged_runs = []
+        for i in range(0, len(runs), MERGE_FAN_IN):
+            group = runs[i:i + MERGE_FAN_IN]
+            merged_runs.append(write_rows(merge_runs(group, key), next_run_path(), fieldnames))
+            for run in group:
+                os.remove(run)
+        runs = merged_runs
+
+    yield from merge_runs(runs, key)
+
+
+def _external_sort(
+        file_path: str,
+        key: KeyType,
+        output_path: str | None,
+        memory_limit: int,
+        workers: int | None,
+        unique: bool,
+) -> None:
+    """
+    Общая часть sort_csv и dedupe_csv
+
+    :param file_path: Путь к исходному файлу
+    :param key: Ключ сортировки (см. make_key)
+    :param output_path: Путь к итоговому файлу (по умолчанию исходный файл заменяется)
+    :param memory_limit: Ограничение памяти в байтах
+    :param workers: Количество процессов
+    :param unique: Оставлять только первую строку для каждого ключа
+    """
+    with open(file_path, encoding='utf-8', newline='') as f:
+        fieldnames = next(csv.reader(f), None)
+    if fieldnames is None:
+        if output_path is not None:
+            shutil.copyfile(file_path, output_path)
+        return
+
+    key_func = make_key(key, fieldnames)
+    output_path = output_path or file_path
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+        rows = sorted_rows(file_path, fieldnames, key_func, tmp_dir, memory_limit, workers or os.cpu_count() or 1)
+        if unique:
+            rows = (next(group) for _, group in groupby(rows, key=key_func))
+        # Исходный файл заменяется только после полной записи результата
+        result_path = write_rows(rows, os.path.join(tmp_dir, 'result.csv'), fieldnames)
+        os.replace(result_path, output_path)
+
+
+def sort_csv(
+        file_path: str,
+        key: KeyType = None,
+        output_path: str | None = None,
+        memory_limit: int = 256 * 2 ** 20,
+        workers: int | None = None,
+) -> None:
+    """
+    Сортировка CSV-файла, который может не помещаться в память.
+    Сортировка устойчивая, значения сравниваются как строки
+    (для другого порядка передайте функцию ключа, определенную на уровне модуля).
+
+    :param file_path: Путь к исходному файлу
+    :param key: Колонка, список колонок или функция от строки (по умолчанию - все колонки)
+    :param output_path: Путь к итоговому файлу (по умолчанию исходный файл заменяется)
+    :param memory_limit: Ограничение памяти на строки в байтах (по умолчанию 256 МБ)
+    :param workers: Количество процессов для сортировки порций (по умолчанию - количество ядер)
+    :raises ValueError: Если в файле есть строки с неверным количеством значений (файл не изменяется)
+    """
+    _external_sort(file_path, key, output_path, memory_limit, workers, unique=False)
+
+
+def dedupe_csv(
+        file_path: str,
+        key: KeyType = None,
+        output_path: str | None = None,
+        memory_limit: int = 256 * 2 ** 20,
+        workers: int | None = None,
+) -> None:
+    """
+    Удаление дубликатов из CSV-файла, который может не помещаться в память.
+    Для каждого ключа остается первая по порядку в файле строка, результат отсортирован по ключу.
+
+    :param file_path: Путь к исходному файлу
+    :param key: Колонка, список колонок или функция от строки (по умолчанию - строка целиком)
+    :param output_path: Путь к итоговому файлу (по умолчанию исходный файл заменяется)
+    :param memory_limit: Ограничение памяти на строки в байтах (по умолчанию 256 МБ)
+    :param workers: Количество процессов для сортировки порций (по умолчанию - количество ядер)
+    :raises ValueError: Если в файле есть строки с неверным количеством значений (файл не изменяется)
+    """
+    _external_sort(file_path, key, output_path, memory_limit, workers, unique=True)
@@ -0,0 +1,257 @@
+"""
+Замеры производительности классов из file_classes.
+Запуск: python file_bench.py
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from concurrent.futures import ProcessPoolExecutor
+
+from async_file_classes import gather_read
+from shared_cache import SharedFileCache
+from file_classes import ColumnarFileHandler, CSVFileHandler, JSONFileHandler, TxtFileHandler
+
+
+def measure(func: Callable, *args, **kwargs) -> tuple[Any, float, int]:
+    """
+    Замер времени выполнения и пикового потребления памяти.
+    tracemalloc заметно замедляет код, поэтому время и память замеряются в разных прогонах.
+
+    :param func: Замеряемая функция
+    :return: Результат функции, время в секундах и пик памяти в байтах (tracemalloc)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def make_products(count: int) -> list[dict]:
+    """
+    Генерация тестовых данных
+
+    :param count: Количество записей
+    :return: Список словарей
+    """
+    return [{'id': i, 'product': f'product_{i}', 'price': i * 1.5, 'tags': ['a', 'b']} for i in range(count)]
+
+
+def bench_json_iter(count: int = 200_000) -> None:
+    """
+    Сравнение JSONFileHandler.read (весь массив в памяти) и JSONFileHandler.iter (по одному элементу)
+    на задаче подсчета суммы цен
+
+    :param count: Количество записей в тестовом файле
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handler = JSONFileHandler(os.path.join(tmp_dir, 'bench.json'))
+        handler.write(make_products(count))
+        print(f'JSON: {count} записей, {os.path.getsize(handler.file_path) / 2 ** 20:.1f} МБ')
+
+        for name, func in (
+                ('read', lambda: sum(item['price'] for item in handler.read())),
+                ('iter', lambda: sum(item['price'] for item in handler.iter())),
+        ):
+            _, elapsed, peak = measure(func)
+            print(f'{name:>6}: {elapsed:.2f} с, пик памяти {peak / 2 ** 20:.1f} МБ')
+
+
+def bench_query(count: int = 500_000) -> None:
+    """
+    Сравнение read() с фильтрацией в Python и query() с выбором колонок и ранней остановкой
+
+    :param count: Количество строк в тестовом CSV-файле
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handler = CSVFileHandler(os.path.join(tmp_dir, 'bench.csv'))
+        handler.write(make_products(count))
+        print(f'CSV: {count} строк, {os.path.getsize(handler.file_path) / 2 ** 20:.1f} МБ')
+
+        def read_and_filter() -> list:
+            rows = [{'id': row['id'], 'price': row['price']} for row in handler.read() if row['id'].endswith('7')]
+            return rows[:100]
+
+        def query() -> list:
+            return handler.query(columns=['id', 'price'], where=lambda row: row['id'].endswith('7'), limit=100)
+
+        def query_all() -> list:
+            return handler.query(columns=['id', 'price'])
+
+        for name, func in (('read', read_and_filter), ('query+limit', query), ('query all', query_all)):
+            _, elapsed, peak = measure(func)
+            print(f'{name:>12}: {elapsed:.3f} с, пик памяти {peak / 2 ** 20:.1f} МБ')
+
+
+def bench_csv_get(count: int = 500_000, lookups: int = 100) -> None:
+    """
+    Сравнение поиска строки по ключу: read() с линейным поиском и get() по индексу
+
+    :param count: Количество строк в тестовом CSV-файле
+    :param lookups: Количество поисков
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handler = CSVFileHandler(os.path.join(tmp_dir, 'bench.csv'), index_column='id')
+        handler.write(make_products(count))
+        keys = [str(i * (count // lookups)) for i in range(lookups)]
+
+        def scan() -> list:
+            return [next(row for row in handler.read() if row['id'] == key) for key in keys[:3]]
+
+        _, elapsed, _ = measure(scan)
+        print(f'{"read + поиск":>14}: {elapsed / 3 * 1000:.1f} мс на поиск')
+        _, elapsed, _ = measure(handler.build_index)
+        print(f'{"build_index":>14}: {elapsed:.2f} с')
+        _, elapsed, _ = measure(lambda: [handler.get(key) for key in keys])
+        print(f'{"get":>14}: {elapsed / lookups * 1000:.3f} мс на поиск')
+
+
+def bench_typed_csv(count: int = 1_000_000) -> None:
+    """
+    Сравнение чтения CSV со строками и ручным преобразованием при каждом
+    обращении и чтения с определением схемы (schema='infer')
+
+    :param count: Количество строк в тестовом CSV-файле
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench.csv')
+        CSVFileHandler(file_path).write(make_products(count))
+        print(f'{count} строк')
+
+        def sum_manual() -> float:
+            rows = CSVFileHandler(file_path).read()
+            return sum(float(row['price']) * int(row['id']) for row in rows)
+
+        def sum_typed() -> float:
+            rows = CSVFileHandler(file_path, schema='infer').read()
+            return sum(row['price'] * row['id'] for row in rows)
+
+        for name, func in (('str + float()', sum_manual), ('schema', sum_typed)):
+            _, elapsed, peak = measure(func)
+            print(f'{name:>14}: {elapsed:.2f} с, пик памяти {peak / 2 ** 20:.0f} МБ')
+
+
+def bench_columnar(count: int = 500_000) -> None:
+    """
+    Сравнение загрузки данных из CSV, JSON и колоночного файла
+
+    :param count: Количество записей
+    """
+    data = [{'id': i, 'price': i * 1.5, 'amount': i % 100, 'product': f'product_{i}'} for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_handler = CSVFileHandler(os.path.join(tmp_dir, 'bench.csv'))
+        json_handler = JSONFileHandler(os.path.join(tmp_dir, 'bench.json'))
+        columnar_handler = ColumnarFileHandler(os.path.join(tmp_dir, 'bench.colf'))
+        csv_handler.write(data)
+        json_handler.write(data)
+        columnar_handler.import_from(json_handler)
+        print(f'{count} записей')
+
+        def load_numeric_columns() -> float:
+            with ColumnarFileHandler(columnar_handler.file_path) as handler:
+                columns = handler.columns(['price'])
+                total = sum(columns['price'])
+                del columns
+            return total
+
+        for name, func in (
+                ('CSV read', csv_handler.read),
+                ('JSON read', json_handler.read),
+                ('columnar read', columnar_handler.read),
+                ('columnar sum', load_numeric_columns),
+        ):
+            _, elapsed, peak = measure(func)
+            print(f'{name:>14}: {elapsed:.3f} с, пик памяти {peak / 2 ** 20:.1f} МБ')
+
+
+def sum_prices(file_path: str, shared: bool) -> int:
+    """
+    Работа одного процесса для bench_shared_cache: сумма цен по всем записям
+
+    :param file_path: Путь к JSON-файлу
+    :param shared: Читать через SharedFileCache или JSONFileHandler.read
+    :return: Пик памяти процесса по tracemalloc в байтах
+    """
+    def work() -> float:
+        if not shared:
+            return sum(item['price'] for item in JSONFileHandler(file_path).read())
+        cache = SharedFileCache(JSONFileHandler(file_path))
+        total = sum(item['price'] for item in cache.load())
+        cache.close()
+        return total
+
+    _, _, peak = measure(work)
+    return peak
+
+
+def bench_shared_cache(count: int = 200_000, workers: int = 4) -> None:
+    """
+    Сравнение памяти работников, читающих один JSON-файл: каждый сам или через SharedFileCache
+
+    :param count: Количество записей в JSON-файле
+    :param workers: Количество процессов
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handler = JSONFileHandler(os.path.join(tmp_dir, 'bench.json'))
+        handler.write(make_products(count))
+        cache = SharedFileCache(handler)
+        try:
+            cache.load()
+            print(f'JSON: {count} записей, {workers} процесса')
+            for name, shared in (('read', False), ('shared cache', True)):
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    peaks = list(executor.map(sum_prices, [handler.file_path] * workers, [shared] * workers))
+                print(f'{name:>13}: пик памяти на процесс {max(peaks) / 2 ** 20:.1f} МБ, '
+                      f'всего {sum(peaks) / 2 ** 20:.1f} МБ')
+        finally:
+            cache.unlink()
+
+
+def bench_async_fan_in(files_count: int = 1000) -> None:
+    """
+    Сравнение последовательного чтения файлов синхронными обработчиками и gather_read
+
+    :param files_count: Количество файлов (поровну TXT, CSV и JSON)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handlers = {'.txt': TxtFileHandler, '.csv': CSVFileHandler, '.json': JSONFileHandler}
+        paths = []
+        for i in range(files_count):
+            extension = list(handlers)[i % len(handlers)]
+            path = os.path.join(tmp_dir, f'file_{i}{extension}')
+            if extension == '.txt':
+                TxtFileHandler(path).write(*(f'line {j}\n' for j in range(50)))
+            else:
+                handlers[extension](path).write(make_products(50))
+            paths.append(path)
+
+        def read_sync() -> list:
+            return [handlers[os.path.splitext(path)[1]](path).read() for path in paths]
+
+        def read_async() -> list:
+            return asyncio.run(gather_read(paths))
+
+        print(f'Чтение {files_count} файлов')
+        for name, func in (('sync', read_sync), ('gather_read', read_async)):
+            _, elapsed, _ = measure(func)
+            print(f'{name:>12}: {elapsed * 1000:.0f} мс')
+
+
+if __name__ == '__main__':
+    bench_json_iter()
+    bench_async_fan_in()
+    bench_query()
+    bench_columnar()
+    bench_csv_get()
+    bench_typed_csv()
+    bench_shared_cache()
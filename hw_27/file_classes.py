@@ -1,7 +1,114 @@
 import csv
+import io
 import json
+import mmap
+import os
+import re
+import struct
+import sys
 from abc import ABC, abstractmethod
-from typing import Any
+from array import array
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    import msvcrt
+    fcntl = None
+
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def lock_file(f: IO) -> None:
+    """
+    Установка эксклюзивной рекомендательной блокировки на открытый файл
+
+    :param f: Открытый файл
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def unlock_file(f: IO) -> None:
+    """
+    Снятие блокировки, установленной lock_file
+
+    :param f: Открытый файл
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+CSV_CONVERTERS = {
+    int: int,
+    float: float,
+    date: date.fromisoformat,
+    datetime: datetime.fromisoformat,
+}
+
+
+def ends_with_newline(file_path: str, size: int) -> bool:
+    """
+    Проверка, заканчивается ли файл переводом строки.
+
+    :param file_path: Путь к файлу
+    :param size: Размер файла
+    :return: True, если файл пустой или его последний байт - перевод строки
+    """
+    if not size:
+        return True
+    with open(file_path, 'rb') as f:
+        f.seek(size - 1)
+        return f.read(1) in (b'\n', b'\r')
+
+
+def detect_value_type(value: str) -> type:
+    """
+    Определение самого узкого типа строкового значения
+
+    :param value: Значение
+    :return: int, float, date, datetime или str
+    """
+    for value_type, convert in CSV_CONVERTERS.items():
+        try:
+            convert(value)
+        except (TypeError, ValueError):
+            continue
+        return value_type
+    return str
+
+
+def infer_csv_schema(rows: Iterable[dict]) -> dict[str, type]:
+    """
+    Определение типов колонок по строкам CSV. Пустые значения не учитываются,
+    int + float дают float, date + datetime - datetime, остальные сочетания - str.
+
+    :param rows: Строки CSV в виде словарей (обычно первые несколько тысяч)
+    :return: Словарь {колонка: тип}
+    """
+    schema = {}
+    for row in rows:
+        for column, value in row.items():
+            current = schema.setdefault(column, None)
+            if not value or current is str:
+                continue
+            value_type = detect_value_type(value)
+            if current is None or current is value_type:
+                schema[column] = value_type
+            elif {current, value_type} in ({int, float}, {date, datetime}):
+                schema[column] = float if float in (current, value_type) else datetime
+            else:
+                schema[column] = str
+    return {column: column_type or str for column, column_type in schema.items()}
 
 
 class AbstractFile(ABC):
@@ -39,6 +146,47 @@ class AbstractFile(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter(self) -> Iterator[Any]:
+        """
+        Метод для потокового чтения записей файла по одной
+
+        :return: Записи файла
+        """
+        pass
+
+    def query(
+            self,
+            columns: list[str] | None = None,
+            where: Callable[[Any], bool] | None = None,
+            limit: int | None = None,
+    ) -> list[Any]:
+        """
+        Метод для выборки записей из файла.
+        Файл читается потоково (iter), в результат попадают только нужные поля,
+        чтение прекращается, как только набрано limit записей.
+
+        :param columns: Поля, которые нужно вернуть (по умолчанию - запись целиком)
+        :param where: Условие отбора, получает запись целиком
+        :param limit: Максимальное количество записей
+        :return: Список отобранных записей
+        """
+        result = []
+        if limit is not None and limit <= 0:
+            return result
+
+        for record in self.iter():
+            if where is not None and not where(record):
+                continue
+            if columns is not None:
+                if not isinstance(record, dict):
+                    raise TypeError('Выбор полей поддерживается только для записей-словарей')
+                record = {column: record.get(column) for column in columns}
+            result.append(record)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
 
 class TxtFileHandler(AbstractFile):
     """
@@ -65,6 +213,18 @@ class TxtFileHandler(AbstractFile):
             print(f'Ошибка при чтении файла: {e}')
             return ''
 
+    def iter(self) -> Iterator[str]:
+        """
+        Метод для построчного чтения текстового файла.
+
+        :return: Строки файла по одной.
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                yield from f
+        except FileNotFoundError:
+            print('Файл не найден')
+
     def write(self, *data: str) -> None:
         """
         Метод для записи данных в текстовый файл.
@@ -94,29 +254,334 @@ class TxtFileHandler(AbstractFile):
 class CSVFileHandler(AbstractFile):
     """
     Класс для работы с CSV-файлами.
+
+    Если указан index_column, рядом с файлом хранится индекс <файл>.<колонка>.idx
+    (значение ключа -> смещение строки в байтах), и метод get находит строку
+    одним переходом по смещению. Первая строка индекса - mtime_ns и размер CSV-файла,
+    по которым индекс проверяется на актуальность и при необходимости перестраивается.
     """
 
-    def __init__(self, file_path:str):
+    INDEX_STAT_SIZE = 42
+    SCHEMA_SAMPLE_SIZE = 1000
+
+    def __init__(
+            self,
+            file_path:str,
+            index_column: str | None = None,
+            schema: dict[str, type] | str | None = None,
+    ):
+        """
+        :param file_path: Путь к файлу
+        :param index_column: Колонка для индекса (для метода get)
+        :param schema: Типы колонок {колонка: тип} (int, float, date, datetime или str),
+            "infer" - определить по первым SCHEMA_SAMPLE_SIZE строкам файла,
+            None - все значения остаются строками. Если значение дальше по файлу
+            не приводится к типу колонки, чтение прерывается с ValueError (с номером строки и колонкой)
+        """
         self.file_path = file_path
+        self.index_column = index_column
+        self.schema = schema
+        self._index = None
+        self._index_stat = None
+        self._index_fieldnames = None
+        self._converters = None
+        self._converters_stat = None
+
+    def converters(self) -> list[tuple[str, Callable[[str], Any]]]:
+        """
+        Преобразователи значений по схеме. Строковые колонки не преобразуются.
+        Преобразователи строятся один раз; определенная по файлу схема ("infer")
+        пересчитывается только после изменения файла (по mtime и размеру, как индекс).
+
+        :return: Список пар (колонка, функция преобразования)
+        """
+        if not self.schema:
+            return []
+        if self.schema != 'infer':
+            if self._converters is None:
+                self._converters = [
+                    (column, CSV_CONVERTERS[column_type])
+                    for column, column_type in self.schema.items() if column_type is not str
+                ]
+            return self._converters
+
+        current_stat = self._pack_stat(os.stat(self.file_path))
+        if self._converters is None or self._converters_stat != current_stat:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                schema = infer_csv_schema(islice(csv.DictReader(f), self.SCHEMA_SAMPLE_SIZE))
+            self._converters = [
+                (column, CSV_CONVERTERS[column_type])
+                for column, column_type in schema.items() if column_type is not str
+            ]
+            self._converters_stat = current_stat
+        return self._converters
+
+    @staticmethod
+    def convert_row(
+            row: dict,
+            converters: list[tuple[str, Callable[[str], Any]]],
+            line_number: int | None = None,
+    ) -> dict:
+        """
+        Преобразование значений строки на месте. Пустые значения становятся None.
+
+        :param row: Строка в виде словаря
+        :param converters: Преобразователи из converters()
+        :param line_number: Номер строки в файле (для сообщения об ошибке)
+        :return: Та же строка
+        :raises ValueError: Если значение не приводится к типу колонки
+        """
+        for column, convert in converters:
+            if column in row:
+                value = row[column]
+                try:
+                    row[column] = convert(value) if value else None
+                except (TypeError, ValueError):
+                    position = f'Строка {line_number}: ' if line_number is not None else ''
+                    raise ValueError(
+                        f'{position}значение {value!r} в колонке {column} не приводится к типу колонки'
+                    ) from None
+        return row
+
+    @property
+    def index_path(self) -> str:
+        """
+        Путь к файлу индекса
+
+        :return: Путь к файлу индекса
+        """
+        return f'{self.file_path}.{self.index_column}.idx'
+
+    @staticmethod
+    def _read_record(f: IO[bytes]) -> bytes:
+        """
+        Чтение одной записи CSV из файла, открытого в бинарном режиме.
+        Запись может занимать несколько строк, если в значениях в кавычках есть переводы строк.
+
+        :param f: Открытый файл
+        :return: Байты записи (пустые в конце файла)
+        """
+        record = f.readline()
+        while record.count(b'"') % 2:
+            line = f.readline()
+            if not line:
+                break
+            record += line
+        return record
+
+    @staticmethod
+    def _parse_record(record: bytes) -> list[str]:
+        """
+        Разбор одной записи CSV
+
+        :param record: Байты записи
+        :return: Значения полей
+        """
+        return next(csv.reader([record.decode('utf-8')]), [])
+
+    @classmethod
+    def _pack_stat(cls, stat: os.stat_result) -> bytes:
+        """
+        Первая строка файла индекса с mtime_ns и размером CSV-файла
+
+        :param stat: Результат os.stat для CSV-файла
+        :return: Строка фиксированной длины INDEX_STAT_SIZE
+        """
+        return f'{stat.st_mtime_ns:020d} {stat.st_size:020d}\n'.encode()
+
+    def build_index(self) -> None:
+        """
+        Метод для построения индекса по колонке index_column.
+        При повторяющихся ключах используется первая строка с этим ключом.
+        """
+        if self.index_column is None:
+            raise ValueError('Колонка для индекса не указана')
+
+        index = {}
+        with open(self.file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            fieldnames = self._parse_record(self._read_record(f))
+            if self.index_column not in fieldnames:
+                raise ValueError(f'Колонка {self.index_column} отсутствует в файле')
+            key_position = fieldnames.index(self.index_column)
+            while True:
+                offset = f.tell()
+                record = self._read_record(f)
+                if not record:
+                    break
+                row = self._parse_record(record)
+                if len(row) > key_position:
+                    index.setdefault(row[key_position], offset)
+
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._pack_stat(stat))
+            f.write(json.dumps({'column': self.index_column, 'fieldnames': fieldnames}).encode() + b'\n')
+            f.writelines(json.dumps([key, offset]).encode() + b'\n' for key, offset in index.items())
+        os.replace(tmp_path, self.index_path)
+        self._index, self._index_stat, self._index_fieldnames = index, self._pack_stat(stat), fieldnames
+
+    def _load_index(self) -> None:
+        """
+        Метод для загрузки актуального индекса (из памяти, с диска или построением заново)
+        """
+        current_stat = self._pack_stat(os.stat(self.file_path))
+        if self._index is not None and self._index_stat == current_stat:
+            return
+        try:
+            with open(self.index_path, 'rb') as f:
+                if f.read(self.INDEX_STAT_SIZE) == current_stat:
+                    meta = json.loads(f.readline())
+                    index = {}
+                    for line in f:
+                        key, offset = json.loads(line)
+                        index.setdefault(key, offset)
+                    self._index, self._index_stat, self._index_fieldnames = index, current_stat, meta['fieldnames']
+                    return
+        except FileNotFoundError:
+            pass
+        self.build_index()
+
+    def _update_index(self, stat_before: os.stat_result, offsets: list[tuple[str, int]], stat_after: os.stat_result) -> None:
+        """
+        Метод для дописывания новых ключей в индекс после append.
+        Если индекс не соответствовал файлу до добавления, он не трогается
+        и будет перестроен при следующем обращении.
+
+        :param stat_before: os.stat CSV-файла до добавления строк
+        :param offsets: Пары (ключ, смещение) добавленных строк
+        :param stat_after: os.stat CSV-файла после добавления строк
+        """
+        try:
+            with open(self.index_path, 'r+b') as f:
+                if f.read(self.INDEX_STAT_SIZE) != self._pack_stat(stat_before):
+                    return
+                f.seek(0, os.SEEK_END)
+                f.writelines(json.dumps([key, offset]).encode() + b'\n' for key, offset in offsets)
+                f.flush()
+                f.seek(0)
+                f.write(self._pack_stat(stat_after))
+        except FileNotFoundError:
+            return
+        if self._index is not None and self._index_stat == self._pack_stat(stat_before):
+            for key, offset in offsets:
+                self._index.setdefault(key, offset)
+            self._index_stat = self._pack_stat(stat_after)
+
+    def get(self, key: str) -> dict | None:
+        """
+        Метод для получения строки по значению колонки index_column.
+
+        :param key: Значение ключа
+        :return: Строка в виде словаря или None, если ключ не найден
+        """
+        try:
+            self._load_index()
+        except FileNotFoundError:
+            print('Файл не найден')
+            return None
+        if key not in self._index:
+            return None
+        with open(self.file_path, 'rb') as f:
+            f.seek(self._index[key])
+            row = self._parse_record(self._read_record(f))
+        return self.convert_row(dict(zip(self._index_fieldnames, row)), self.converters())
 
     def read(self) -> list[dict]:
         """
         Метод для чтения CSV-файла.
 
         :return: Список словарей с данными из файла.
+        :raises ValueError: Если значение не приводится к типу колонки из схемы
         """
         try:
+            converters = self.converters()
             with open(self.file_path, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
-                return list(reader)
+                if not converters:
+                    return list(reader)
+                return [self.convert_row(row, converters, reader.line_num) for row in reader]
         except FileNotFoundError:
             print('Файл не найден')
             return []
+        except ValueError:
+            # Частично прочитанный файл нельзя выдавать за пустой
+            raise
         except Exception as e:
             print(f'Ошибка при чтении файла: {e}')
             return []
 
 
+    def iter(self) -> Iterator[dict]:
+        """
+        Метод для построчного чтения CSV-файла.
+
+        :return: Строки файла в виде словарей по одной.
+        :raises ValueError: Если значение не приводится к типу колонки из схемы
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                converters = self.converters()
+                reader = csv.DictReader(f)
+                if not converters:
+                    yield from reader
+                    return
+                for row in reader:
+                    yield self.convert_row(row, converters, reader.line_num)
+        except FileNotFoundError:
+            print('Файл не найден')
+
+    def query(
+            self,
+            columns: list[str] | None = None,
+            where: Callable[[dict], bool] | None = None,
+            limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Метод для выборки записей из CSV-файла.
+        Строки разбираются csv.reader в списки, словарь строится только из нужных колонок
+        (и целиком - только если задано условие where).
+
+        :param columns: Колонки, которые нужно вернуть (по умолчанию - все)
+        :param where: Условие отбора, получает строку целиком в виде словаря
+        :param limit: Максимальное количество записей
+        :return: Список отобранных записей
+        """
+        if columns is None:
+            return super().query(columns, where, limit)
+
+        result = []
+        if limit is not None and limit <= 0:
+            return result
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    return result
+                missing_columns = [column for column in columns if column not in header]
+                if missing_columns:
+                    print(f'Колонки {missing_columns} отсутствуют в файле')
+                    return result
+
+                indices = [header.index(column) for column in columns]
+                converters = self.converters()
+                for row in reader:
+                    if not row:
+                        continue
+                    if len(row) < len(header):
+                        row += [None] * (len(header) - len(row))
+                    if where is not None and not where(self.convert_row(dict(zip(header, row)), converters, reader.line_num)):
+                        continue
+                    result.append(self.convert_row(
+                        {column: row[i] for column, i in zip(columns, indices)}, converters, reader.line_num
+                    ))
+                    if limit is not None and len(result) >= limit:
+                        break
+        except FileNotFoundError:
+            print('Файл не найден')
+        return result
+
     def write(self, data: list[dict]) -> None:
         """
         Метод для записи данных в CSV-файл.
@@ -137,6 +602,8 @@ class CSVFileHandler(AbstractFile):
     def append(self, data: list[dict]) -> None:
         """
         Метод для добавления данных в CSV-файл.
+        Из файла читается только заголовок, новые строки дописываются в конец
+        под блокировкой файла, поэтому добавлять данные могут несколько процессов сразу.
 
         :param data: Данные для добавления в файл (список словарей).
         """
@@ -145,9 +612,48 @@ class CSVFileHandler(AbstractFile):
             return
 
         try:
-            existing_data = self.read()
-            combined_data = existing_data + data
-            self.write(combined_data)
+            with open(self.file_path, 'a+', encoding='utf-8', newline='') as f:
+                lock_file(f)
+                try:
+                    f.seek(0)
+                    header = f.readline()
+                    if header:
+                        fieldnames = next(csv.reader([header]))
+                        unknown_fields = {key for row in data for key in row} - set(fieldnames)
+                        if unknown_fields:
+                            print(f'Поля {sorted(unknown_fields)} отсутствуют в заголовке файла')
+                            return
+                    else:
+                        fieldnames = list(data[0].keys())
+
+                    f.seek(0, os.SEEK_END)
+                    stat_before = os.fstat(f.fileno())
+                    buffer = io.StringIO()
+                    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+                    if not header:
+                        writer.writeheader()
+                    elif not ends_with_newline(self.file_path, stat_before.st_size):
+                        # Иначе первая новая строка склеится с последней строкой файла
+                        buffer.write(writer.writer.dialect.lineterminator)
+                    # Смещения новых строк нужны для обновления индекса
+                    offsets = []
+                    position = stat_before.st_size + len(buffer.getvalue().encode('utf-8'))
+                    chunks = [buffer.getvalue()]
+                    for row in data:
+                        buffer.seek(0)
+                        buffer.truncate()
+                        writer.writerow(row)
+                        chunk = buffer.getvalue()
+                        if self.index_column is not None:
+                            offsets.append((str(row.get(self.index_column, '')), position))
+                        position += len(chunk.encode('utf-8'))
+                        chunks.append(chunk)
+                    f.write(''.join(chunks))
+                    f.flush()
+                    if self.index_column is not None and header:
+                        self._update_index(stat_before, offsets, os.fstat(f.fileno()))
+                finally:
+                    unlock_file(f)
         except Exception as e:
             print(f'Ошибка при добавлении данных в файл: {e}')
 
@@ -179,6 +685,72 @@ class JSONFileHandler(AbstractFile):
             print(f'Ошибка при чтении файла: {e}')
             return []
 
+    def iter(self, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """
+        Метод для потокового чтения JSON-файла с массивом на верхнем уровне.
+        Файл читается блоками по chunk_size символов, элементы массива разбираются
+        по одному (json.JSONDecoder.raw_decode), поэтому в памяти находится только
+        текущий элемент и непрочитанный остаток блока.
+
+        :param chunk_size: Размер блока чтения в символах
+        :return: Элементы массива по одному
+        """
+        decoder = json.JSONDecoder()
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                buffer = ''
+                position = 0
+                eof = False
+
+                def read_more() -> None:
+                    nonlocal buffer, position, eof
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+
+                def next_char() -> str:
+                    nonlocal position
+                    while True:
+                        position = JSON_WHITESPACE.match(buffer, position).end()
+                        if position < len(buffer) or eof:
+                            return buffer[position:position + 1]
+                        read_more()
+
+                if next_char() != '[':
+                    print('Файл не содержит JSON-массив')
+                    return
+                position += 1
+                if next_char() == ']':
+                    return
+
+                while True:
+                    next_char()
+                    try:
+                        item, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        read_more()
+                        continue
+                    # Число в конце блока может быть обрезано - дочитываем и разбираем заново
+                    if not eof and (end == len(buffer) or buffer[end] in '0123456789.eE+-'):
+                        read_more()
+                        continue
+                    position = end
+                    yield item
+
+                    separator = next_char()
+                    if separator == ']':
+                        return
+                    if separator != ',':
+                        raise json.JSONDecodeError('Ожидалась "," или "]"', buffer, position)
+                    position += 1
+        except FileNotFoundError:
+            print('Файл не найден')
+        except json.JSONDecodeError:
+            print('Не удалось декодировать данные')
+
     def write(self, data: list[dict]) -> None:
         """
         Метод для записи данных в JSON-файл.
@@ -203,3 +775,343 @@ class JSONFileHandler(AbstractFile):
             self.write(combined_data)
         except Exception as e:
             print(f'Ошибка при добавлении данных в файл: {e}')
+
+
+class ColumnarFileHandler(AbstractFile):
+    """
+    Класс для работы с бинарным колоночным форматом.
+
+    Структура файла:
+        b'COLF' + версия (1 байт)
+        длина заголовка (uint32) + заголовок в JSON: количество строк и схема колонок
+        блоки колонок, выровненные по 8 байт:
+            int64 / float64 - значения подряд (little-endian);
+            bool - по байту на значение (0 или 1);
+            str - смещения строк (int64, rows + 1 штук) и строки в UTF-8 подряд;
+            для колонок с пропусками (None) - дополнительный блок битовой маски
+            (бит i равен 1, если значение в строке i задано).
+
+    Файл читается через mmap, числовые и логические колонки без пропусков возвращаются
+    как memoryview без копирования. Если файл изменился (другой обработчик или процесс
+    записал его), отображение создается заново.
+    Формат рассчитан на данные, которые часто читаются и редко меняются:
+    append перезаписывает файл целиком.
+    """
+
+    MAGIC = b'COLF'
+    VERSION = 2
+    # Версия 1 не содержит логических колонок и пропусков, поэтому читается так же
+    SUPPORTED_VERSIONS = (1, 2)
+    TYPECODES = {'int64': 'q', 'float64': 'd', 'bool': '?'}
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+        self._mmap = None
+        self._mmap_stat = None
+
+    def __enter__(self) -> 'ColumnarFileHandler':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Метод для закрытия отображения файла в память.
+        Перед вызовом нужно освободить все memoryview, полученные из columns().
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = self._mmap_stat = None
+
+    def _release(self) -> None:
+        """
+        Метод для сброса устаревшего отображения файла.
+        Если на него еще есть memoryview, оно закроется сборщиком мусора после их освобождения.
+        """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._file.close()
+            self._mmap = self._file = self._mmap_stat = None
+
+    @staticmethod
+    def infer_schema(data: list[dict], parse_strings: bool = False) -> dict[str, str]:
+        """
+        Метод для определения типов колонок по данным.
+        Пропуски (None) не влияют на тип колонки, int и float дают float64,
+        bool с числами - str.
+
+        :param data: Данные (список словарей)
+        :param parse_strings: Считать ли строки с числами числами, а пустые строки - пропусками (для данных из CSV)
+        :return: Словарь {колонка: тип}, где тип - "bool", "int64", "float64" или "str"
+        """
+        schema = {}
+        for row in data:
+            for column, value in row.items():
+                current = schema.setdefault(column, None)
+                if current == 'str':
+                    continue
+                if isinstance(value, str) and parse_strings:
+                    value = ColumnarFileHandler._parse_string(value)
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value_type = 'bool'
+                elif isinstance(value, int):
+                    value_type = 'int64'
+                elif isinstance(value, float):
+                    value_type = 'float64'
+                else:
+                    value_type = 'str'
+                if current is None or current == value_type:
+                    schema[column] = value_type
+                elif {current, value_type} == {'int64', 'float64'}:
+                    schema[column] = 'float64'
+                else:
+                    schema[column] = 'str'
+        return {column: column_type or 'str' for column, column_type in schema.items()}
+
+    @staticmethod
+    def _parse_string(value: str) -> int | float | str | None:
+        """
+        Метод для преобразования строки из CSV в число или пропуск
+
+        :param value: Строка
+        :return: int, float, None для пустой строки или исходная строка
+        """
+        if value == '':
+            return None
+        for convert in (int, float):
+            try:
+                return convert(value)
+            except ValueError:
+                pass
+        return value
+
+    def write(self, data: list[dict], schema: dict[str, str] | None = None) -> None:
+        """
+        Метод для записи данных в колоночный файл.
+        Поддерживаются значения str, int, float, bool и None (пропуск).
+
+        :param data: Данные для записи в файл (список словарей)
+        :param schema: Типы колонок (по умолчанию определяются по данным)
+        :raises TypeError: Если значение другого типа (список, словарь и т.п.)
+        """
+        if schema is None:
+            schema = self.infer_schema(data)
+        self.close()
+
+        blocks = []
+        columns = []
+        offset = 0
+        for column, column_type in schema.items():
+            values = [row.get(column) for row in data]
+            for value in values:
+                if value is not None and not isinstance(value, (str, int, float)):
+                    raise TypeError(f'Значение типа {type(value).__name__} в колонке {column} не поддерживается')
+            if column_type in self.TYPECODES:
+                convert = {'int64': int, 'float64': float, 'bool': bool}[column_type]
+                column_values = [0 if value is None else convert(value) for value in values]
+                if column_type == 'bool':
+                    column_blocks = [bytes(column_values)]
+                else:
+                    column_blocks = [array(self.TYPECODES[column_type], column_values)]
+            else:
+                encoded = [('' if value is None else str(value)).encode('utf-8') for value in values]
+                offsets = array('q', [0])
+                for item in encoded:
+                    offsets.append(offsets[-1] + len(item))
+                column_blocks = [offsets, b''.join(encoded)]
+
+            column_info = {'name': column, 'type': column_type, 'blocks': []}
+            if None in values:
+                validity = bytearray((len(values) + 7) // 8)
+                for i, value in enumerate(values):
+                    if value is not None:
+                        validity[i >> 3] |= 1 << (i & 7)
+                column_blocks.append(bytes(validity))
+                column_info['nullable'] = True
+
+            for block in column_blocks:
+                if sys.byteorder != 'little' and isinstance(block, array):
+                    block.byteswap()
+                block = bytes(block)
+                column_info['blocks'].append([offset, len(block)])
+                padding = b'\0' * (-len(block) % 8)
+                blocks.append(block + padding)
+                offset += len(block) + len(padding)
+            columns.append(column_info)
+
+        header = json.dumps({'rows': len(data), 'columns': columns}).encode('utf-8')
+        # Дополняем заголовок пробелами, чтобы блоки данных были выровнены по 8 байт
+        header += b' ' * (-(len(self.MAGIC) + 1 + 4 + len(header)) % 8)
+        # Пишем во временный файл и подменяем: уже открытые через mmap копии остаются рабочими
+        tmp_path = f'{self.file_path}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self.MAGIC + bytes([self.VERSION]))
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                f.writelines(blocks)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            print(f'Ошибка при записи файла: {e}')
+
+    @staticmethod
+    def _file_stat(stat: os.stat_result) -> tuple[int, int, int]:
+        """
+        Метод для получения признаков изменения файла
+
+        :param stat: Результат os.stat для файла
+        :return: Кортеж (inode, mtime_ns, размер)
+        """
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _open(self) -> tuple[mmap.mmap, dict, int]:
+        """
+        Метод для отображения файла в память и чтения заголовка
+
+        :return: mmap, заголовок и смещение начала блоков данных
+        """
+        if self._mmap is not None and self._file_stat(os.stat(self.file_path)) != self._mmap_stat:
+            self._release()
+        if self._mmap is None:
+            self._file = open(self.file_path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_stat = self._file_stat(os.fstat(self._file.fileno()))
+        if self._mmap[:len(self.MAGIC)] != self.MAGIC or self._mmap[len(self.MAGIC)] not in self.SUPPORTED_VERSIONS:
+            raise ValueError('Неизвестный формат файла')
+        header_start = len(self.MAGIC) + 1 + 4
+        (header_size,) = struct.unpack_from('<I', self._mmap, len(self.MAGIC) + 1)
+        header = json.loads(self._mmap[header_start:header_start + header_size])
+        return self._mmap, header, header_start + header_size
+
+    def _column_views(self) -> tuple[int, dict[str, tuple[str, list[memoryview], memoryview | None]]]:
+        """
+        Метод для получения memoryview на блоки всех колонок
+
+        :return: Количество строк и словарь {колонка: (тип, блоки, битовая маска пропусков или None)}
+        """
+        mm, header, data_start = self._open()
+        view = memoryview(mm)
+        columns = {}
+        for column in header['columns']:
+            blocks = []
+            for i, (offset, length) in enumerate(column['blocks']):
+                block = view[data_start + offset:data_start + offset + length]
+                if column['type'] in self.TYPECODES and i == 0:
+                    block = block.cast(self.TYPECODES[column['type']])
+                elif column['type'] == 'str' and i == 0:
+                    block = block.cast('q')
+                blocks.append(block)
+            validity = blocks.pop() if column.get('nullable') else None
+            columns[column['name']] = (column['type'], blocks, validity)
+        return header['rows'], columns
+
+    def columns(self, names: list[str] | None = None) -> dict[str, memoryview | list[str]]:
+        """
+        Метод для чтения файла по колонкам.
+        Числовые и логические колонки без пропусков возвращаются как memoryview на отображенный
+        в память файл (без копирования), строковые и колонки с пропусками - списком (пропуск - None).
+
+        :param names: Колонки, которые нужно прочитать (по умолчанию - все)
+        :return: Словарь {колонка: значения}
+        """
+        try:
+            _, columns = self._column_views()
+        except FileNotFoundError:
+            print('Файл не найден')
+            return {}
+
+        result = {}
+        for name, (column_type, blocks, validity) in columns.items():
+            if names is not None and name not in names:
+                continue
+            if column_type in self.TYPECODES:
+                if sys.byteorder == 'little' or column_type == 'bool':
+                    values = blocks[0]
+                else:
+                    values = array(self.TYPECODES[column_type], blocks[0].tobytes())
+                    values.byteswap()
+                    values = memoryview(values)
+            else:
+                offsets, data = blocks
+                if sys.byteorder != 'little':
+                    offsets = array('q', offsets.tobytes())
+                    offsets.byteswap()
+                text = bytes(data)
+                values = [text[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+            if validity is not None:
+                values = [value if validity[i >> 3] >> (i & 7) & 1 else None for i, value in enumerate(values)]
+            result[name] = values
+        return result
+
+    def iter(self) -> Iterator[dict]:
+        """
+        Метод для построчного чтения колоночного файла.
+
+        :return: Строки файла в виде словарей по одной.
+        """
+        columns = self.columns()
+        names = list(columns)
+        yield from (dict(zip(names, values)) for values in zip(*columns.values()))
+
+    def read(self) -> list[dict]:
+        """
+        Метод для чтения колоночного файла построчно.
+
+        :return: Список словарей с данными из файла
+        """
+        try:
+            return list(self.iter())
+        except Exception as e:
+            print(f'Ошибка при чтении файла: {e}')
+            return []
+
+    def append(self, data: list[dict]) -> None:
+        """
+        Метод для добавления данных в колоночный файл (файл перезаписывается целиком).
+
+        :param data: Данные для добавления в файл (список словарей)
+        """
+        try:
+            # Данные всегда берутся из текущего файла, а не из ранее созданного отображения
+            self._release()
+            existing_data = self.read() if os.path.exists(self.file_path) else []
+            combined_data = existing_data + data
+            self.write(combined_data)
+        except Exception as e:
+            print(f'Ошибка при добавлении данных в файл: {e}')
+
+    def import_from(self, handler: AbstractFile) -> None:
+        """
+        Метод для заполнения файла данными из другого обработчика (CSV или JSON).
+        Числа, записанные в CSV строками, сохраняются как числа, пустые значения
+        в числовых колонках - как пропуски.
+
+        :param handler: Обработчик исходного файла
+        """
+        data = list(handler.iter())
+        if not isinstance(handler, CSVFileHandler):
+            self.write(data)
+            return
+        schema = self.infer_schema(data, parse_strings=True)
+        typed_columns = [column for column, column_type in schema.items() if column_type != 'str']
+        for row in data:
+            for column in typed_columns:
+                if isinstance(row.get(column), str):
+                    row[column] = self._parse_string(row[column])
+        self.write(data, schema)
+
+    def export_to(self, handler: AbstractFile) -> None:
+        """
+        Метод для записи данных файла через другой обработчик (CSV или JSON).
+
+        :param handler: Обработчик итогового файла
+        """
+        handler.write(self.read())
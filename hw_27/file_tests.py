@@ -1,5 +1,12 @@
 # Работа с TXT файлами
-from file_classes import TxtFileHandler, CSVFileHandler, JSONFileHandler
+import asyncio
+import os
+
+import external_sort
+from async_file_classes import AsyncJSONFileHandler, gather_read
+from external_sort import dedupe_csv, sort_csv
+from shared_cache import SharedFileCache
+from file_classes import TxtFileHandler, CSVFileHandler, JSONFileHandler, ColumnarFileHandler
 
 
 def test_txt_file_handler():
@@ -17,6 +24,83 @@ def test_csv_file_handler():
     content_csv = csv_handler.read()
     print("Содержимое CSV:\n", content_csv)
 
+    csv_handler.append([{'name': 'Dave', 'email': 'dave@example.com'}])
+    assert csv_handler.read() == content_csv
+
+    adults = csv_handler.query(columns=['name'], where=lambda row: int(row['age']) > 28, limit=1)
+    print("Выборка из CSV:\n", adults)
+    assert adults == [{'name': 'Alice'}]
+
+    typed_handler = CSVFileHandler("example.csv", schema='infer')
+    assert typed_handler.read()[0] == {'name': 'Alice', 'age': 30}
+    assert typed_handler.query(columns=['name'], where=lambda row: row['age'] > 28) == [{'name': 'Alice'}, {'name': 'Charlie'}]
+    assert typed_handler.converters() is typed_handler.converters()
+
+    # Значение, не подходящее к типу, определенному по первым SCHEMA_SAMPLE_SIZE строкам
+    with open("example_typed.csv", "w", encoding="utf-8") as f:
+        f.write("id\n" + "".join(f"{i}\n" for i in range(1500)) + "abc\n")
+    typed_handler = CSVFileHandler("example_typed.csv", schema='infer')
+    for read in (typed_handler.read, lambda: list(typed_handler.iter())):
+        try:
+            read()
+        except ValueError as e:
+            print("Ошибка преобразования:", e)
+            assert 'Строка 1502' in str(e) and 'id' in str(e)
+        else:
+            raise AssertionError("Ошибка преобразования должна выбрасывать ValueError")
+    os.remove("example_typed.csv")
+
+def test_csv_index():
+    csv_handler = CSVFileHandler("example.csv", index_column="name")
+    assert csv_handler.get("Bob") == {'name': 'Bob', 'age': '25'}
+    assert csv_handler.get("Nobody") is None
+    print("Строка по ключу:\n", csv_handler.get("Charlie"))
+
+    # Файл без перевода строки в конце
+    with open("example_no_newline.csv", "w", encoding="utf-8") as f:
+        f.write("name,age\nAlice,30")
+    csv_handler = CSVFileHandler("example_no_newline.csv", index_column="name")
+    assert csv_handler.get("Alice") == {'name': 'Alice', 'age': '30'}
+    csv_handler.append([{'name': 'Bob', 'age': '25'}])
+    assert csv_handler.read() == [{'name': 'Alice', 'age': '30'}, {'name': 'Bob', 'age': '25'}]
+    assert csv_handler.get("Bob") == {'name': 'Bob', 'age': '25'}
+    os.remove("example_no_newline.csv")
+    os.remove(csv_handler.index_path)
+
+def test_external_sort():
+    csv_handler = CSVFileHandler("example_sorted.csv")
+    data_csv = [{'name': name, 'age': str(age)} for age in range(30, 0, -1) for name in ('Bob', 'Alice')]
+    csv_handler.write(data_csv)
+
+    sort_csv("example_sorted.csv", key='age', memory_limit=2000, workers=2)
+    assert csv_handler.read() == sorted(data_csv, key=lambda row: row['age'])
+
+    dedupe_csv("example_sorted.csv", key='name', memory_limit=2000, workers=2)
+    content_csv = csv_handler.read()
+    print("Отсортированный CSV без дубликатов:\n", content_csv)
+    assert content_csv == [{'name': 'Alice', 'age': '1'}, {'name': 'Bob', 'age': '1'}]
+
+    # Слияние в несколько проходов
+    csv_handler.write(data_csv)
+    merge_fan_in, external_sort.MERGE_FAN_IN = external_sort.MERGE_FAN_IN, 2
+    try:
+        sort_csv("example_sorted.csv", key='age', memory_limit=500, workers=2)
+    finally:
+        external_sort.MERGE_FAN_IN = merge_fan_in
+    assert csv_handler.read() == sorted(data_csv, key=lambda row: row['age'])
+
+    # Строка с лишним значением - ошибка, исходный файл не меняется
+    with open("example_sorted.csv", "a", encoding="utf-8") as f:
+        f.write("bad,1,extra\n")
+    try:
+        sort_csv("example_sorted.csv", key='name')
+    except ValueError as e:
+        print("Ошибка сортировки:", e)
+    else:
+        raise AssertionError("sort_csv должен отклонять строки с лишними значениями")
+    assert csv_handler.read()[:len(data_csv)] == sorted(data_csv, key=lambda row: row['age'])
+    os.remove("example_sorted.csv")
+
 def test_json_file_handler():
     json_handler = JSONFileHandler("example.json")
     data_json = [{'product': 'Laptop', 'price': 1500}, {'product': 'Phone', 'price': 800}]
@@ -24,8 +108,71 @@ def test_json_file_handler():
     json_handler.append([{'product': 'Tablet', 'price': 600}])
     content_json = json_handler.read()
     print("Содержимое JSON:\n", content_json)
+    assert list(json_handler.iter(chunk_size=8)) == content_json
+    assert json_handler.query(columns=['product'], where=lambda item: item['price'] < 1000) == [
+        {'product': 'Phone'}, {'product': 'Tablet'}
+    ]
+
+def test_columnar_file_handler():
+    with ColumnarFileHandler("example.colf") as columnar_handler:
+        columnar_handler.import_from(JSONFileHandler("example.json"))
+        content_columnar = columnar_handler.read()
+        print("Содержимое колоночного файла:\n", content_columnar)
+        assert content_columnar == JSONFileHandler("example.json").read()
+
+        columns = columnar_handler.columns()
+        assert list(columns['price']) == [item['price'] for item in content_columnar]
+        del columns
+
+    with ColumnarFileHandler("example_nulls.colf") as columnar_handler:
+        data_nulls = [{'id': 1, 'active': True, 'name': 'a'}, {'id': None, 'active': False, 'name': None}]
+        columnar_handler.write(data_nulls)
+        assert columnar_handler.read() == data_nulls
+
+        # Файл изменен другим обработчиком - отображение обновляется, append не теряет его строки
+        ColumnarFileHandler("example_nulls.colf").write(data_nulls * 2)
+        assert columnar_handler.read() == data_nulls * 2
+        columnar_handler.append([{'id': 3, 'active': True, 'name': 'c'}])
+        assert len(ColumnarFileHandler("example_nulls.colf").read()) == 5
+    os.remove("example_nulls.colf")
+
+def test_shared_cache():
+    cache = SharedFileCache(JSONFileHandler("example.json"))
+    try:
+        products = cache.load()
+        print("Содержимое JSON из разделяемой памяти:\n", list(products))
+        assert list(products) == JSONFileHandler("example.json").read()
+        assert products[-1] == {'product': 'Tablet', 'price': 600}
+
+        # После изменения файла сегмент старой версии удаляется
+        old_name = cache.name
+        json_handler = JSONFileHandler("example.json")
+        json_handler.write(json_handler.read()[:2])
+        assert len(cache.load()) == 2
+        json_handler.append([{'product': 'Tablet', 'price': 600}])
+        if os.path.isdir('/dev/shm'):
+            assert not os.path.exists(f'/dev/shm/{old_name}')
+    finally:
+        cache.unlink()
+    assert not os.path.exists(f'{cache.handler.file_path}.shm')
+
+def test_async_file_handlers():
+    async def run():
+        json_handler = AsyncJSONFileHandler("example.json")
+        content_json = await json_handler.read()
+        await json_handler.write(content_json)
+        return content_json, await gather_read(["example.txt", "example.csv", "example.json"])
+
+    content_json, contents = asyncio.run(run())
+    print("Содержимое файлов:\n", contents)
+    assert contents == [TxtFileHandler("example.txt").read(), CSVFileHandler("example.csv").read(), content_json]
 
 if __name__ == '__main__':
     test_txt_file_handler()
     test_csv_file_handler()
+    test_csv_index()
+    test_external_sort()
     test_json_file_handler()
+    test_columnar_file_handler()
+    test_async_file_handlers()
+    test_shared_cache()
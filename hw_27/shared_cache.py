@@ -0,0 +1,251 @@
+import hashlib
+import os
+import pickle
+import struct
+import time
+from collections.abc import Sequence
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+from file_classes import AbstractFile
+
+MAGIC = b'SHFC'
+# magic, флаг готовности, признак списка (иначе - одно значение), количество записей
+HEADER = struct.Struct('<4s??xxq')
+OFFSET = struct.Struct('<q')
+
+
+class SharedRecords(Sequence):
+    """
+    Список записей, лежащих в разделяемой памяти.
+    Каждая запись хранится отдельно (pickle) и разбирается только при обращении к ней,
+    поэтому процесс не держит у себя копию всего файла.
+    """
+
+    def __init__(self, buffer: memoryview):
+        _, _, _, self._count = HEADER.unpack_from(buffer)
+        self._buffer = buffer
+        self._data_start = HEADER.size + (self._count + 1) * OFFSET.size
+
+    def _offset(self, i: int) -> int:
+        return OFFSET.unpack_from(self._buffer, HEADER.size + i * OFFSET.size)[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('Индекс записи вне диапазона')
+        start, end = self._offset(i), self._offset(i + 1)
+        return pickle.loads(self._buffer[self._data_start + start:self._data_start + end])
+
+
+class SharedFileCache:
+    """
+    Кэш разобранного содержимого файла в multiprocessing.shared_memory.
+
+    Первый процесс, обратившийся к файлу, читает его обработчиком (read())
+    и сохраняет записи в разделяемую память. Остальные процессы подключаются
+    к готовому сегменту и разбирают записи лениво, по одной.
+    Имя сегмента состоит из постоянного для файла префикса и версии (mtime и размер),
+    поэтому измененный файл попадает в новый сегмент. Имя последнего созданного сегмента
+    записывается рядом с файлом (file_path + '.shm'): при создании новой версии
+    предыдущий сегмент удаляется, чтобы не занимать память до перезагрузки.
+    Сегмент живет, пока не вызван unlink() (обычно - в родительском процессе
+    после завершения работников).
+
+    Пример:
+        cache = SharedFileCache(JSONFileHandler('products.json'))
+        products = cache.load()
+        print(len(products), products[0])
+    """
+
+    def __init__(self, handler: AbstractFile, wait_timeout: float = 60.0):
+        self.handler = handler
+        self.wait_timeout = wait_timeout
+        self._shm = None
+
+    @property
+    def prefix(self) -> str:
+        """
+        Постоянная для файла часть имени сегмента
+
+        :return: Префикс имени сегмента
+        """
+        key = f'{type(self.handler).__name__}|{os.path.abspath(self.handler.file_path)}'
+        return 'fc_' + hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    @property
+    def name(self) -> str:
+        """
+        Имя сегмента разделяемой памяти для текущей версии файла
+
+        :return: Имя сегмента
+        """
+        stat = os.stat(self.handler.file_path)
+        version = hashlib.sha1(f'{stat.st_mtime_ns}|{stat.st_size}'.encode()).hexdigest()[:8]
+        return f'{self.prefix}_{version}'
+
+    @property
+    def marker_path(self) -> str:
+        """
+        Путь к файлу с именем последнего созданного сегмента
+
+        :return: Путь к файлу
+        """
+        return f'{self.handler.file_path}.shm'
+
+    def _last_name(self) -> str | None:
+        """
+        Имя последнего созданного для файла сегмента
+
+        :return: Имя сегмента или None
+        """
+        try:
+            with open(self.marker_path, 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return name if name.startswith(self.prefix) else None
+
+    def _remember(self, name: str) -> None:
+        """
+        Запоминание имени нового сегмента и удаление сегмента предыдущей версии файла
+
+        :param name: Имя нового сегмента
+        """
+        last_name = self._last_name()
+        if last_name is not None and last_name != name:
+            self._unlink_segment(last_name)
+        tmp_path = f'{self.marker_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(name)
+        os.replace(tmp_path, self.marker_path)
+
+    @classmethod
+    def _unlink_segment(cls, name: str) -> None:
+        """
+        Удаление сегмента из системы. Процессы, уже подключенные к нему, могут
+        пользоваться им до отключения.
+
+        :param name: Имя сегмента
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return
+        cls._untrack(shm)
+        if os.name == 'posix':
+            resource_tracker.register(shm._name, 'shared_memory')
+        shm.close()
+        shm.unlink()
+
+    @staticmethod
+    def _untrack(shm: shared_memory.SharedMemory) -> None:
+        """
+        Отключение автоматического удаления сегмента при завершении процесса:
+        иначе первый завершившийся работник удалил бы сегмент, нужный остальным.
+
+        :param shm: Сегмент разделяемой памяти
+        """
+        if os.name == 'posix':
+            resource_tracker.unregister(shm._name, 'shared_memory')
+
+    def _create(self, name: str) -> shared_memory.SharedMemory:
+        """
+        Чтение файла и создание сегмента с его записями
+
+        :param name: Имя сегмента
+        :return: Сегмент разделяемой памяти
+        """
+        data = self.handler.read()
+        is_list = isinstance(data, list)
+        records = data if is_list else [data]
+        payloads = [pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL) for record in records]
+        data_start = HEADER.size + (len(payloads) + 1) * OFFSET.size
+        size = data_start + sum(len(payload) for payload in payloads)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        self._untrack(shm)
+        position = 0
+        for i, payload in enumerate(payloads):
+            OFFSET.pack_into(shm.buf, HEADER.size + i * OFFSET.size, position)
+            shm.buf[data_start + position:data_start + position + len(payload)] = payload
+            position += len(payload)
+        OFFSET.pack_into(shm.buf, HEADER.size + len(payloads) * OFFSET.size, position)
+        # Флаг готовности записывается последним
+        HEADER.pack_into(shm.buf, 0, MAGIC, True, is_list, len(payloads))
+        return shm
+
+    def _attach(self, name: str) -> shared_memory.SharedMemory:
+        """
+        Подключение к сегменту, созданному другим процессом, с ожиданием его заполнения
+
+        :param name: Имя сегмента
+        :return: Сегмент разделяемой памяти
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        self._untrack(shm)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            if len(shm.buf) >= HEADER.size:
+                magic, ready, _, _ = HEADER.unpack_from(shm.buf)
+                if magic == MAGIC and ready:
+                    return shm
+            if time.monotonic() > deadline:
+                shm.close()
+                raise TimeoutError(f'Сегмент {name} не был заполнен за {self.wait_timeout} с')
+            time.sleep(0.01)
+
+    def load(self) -> SharedRecords | Any:
+        """
+        Метод для получения содержимого файла из разделяемой памяти.
+        Возвращенный SharedRecords можно использовать до вызова close().
+
+        :return: SharedRecords, если read() обработчика возвращает список, иначе - само значение
+        """
+        name = self.name
+        if self._shm is None or self._shm.name.lstrip('/') != name:
+            self.close()
+            try:
+                self._shm = self._attach(name)
+            except FileNotFoundError:
+                try:
+                    self._shm = self._create(name)
+                except FileExistsError:
+                    self._shm = self._attach(name)
+                else:
+                    self._remember(name)
+
+        _, _, is_list, _ = HEADER.unpack_from(self._shm.buf)
+        records = SharedRecords(self._shm.buf)
+        return records if is_list else records[0]
+
+    def close(self) -> None:
+        """
+        Метод для отключения от сегмента в текущем процессе
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self) -> None:
+        """
+        Метод для удаления сегментов файла (текущей и последней созданной версии) из системы
+        """
+        self.close()
+        names = {self._last_name()}
+        try:
+            names.add(self.name)
+        except FileNotFoundError:
+            pass
+        for name in names - {None}:
+            self._unlink_segment(name)
+        try:
+            os.remove(self.marker_path)
+        except FileNotFoundError:
+            pass